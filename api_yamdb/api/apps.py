@@ -1,6 +1,28 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from api_yamdb.db import check_connections, configure_sqlite_connection
+        from . import signals  # noqa: F401
+        from .cache import check_caches
+        from .retry import configure_transaction_mode
+
+        check_caches()
+
+        connection_created.connect(
+            configure_sqlite_connection,
+            dispatch_uid='configure_sqlite_connection'
+        )
+        connection_created.connect(
+            configure_transaction_mode,
+            dispatch_uid='configure_transaction_mode'
+        )
+        request_started.connect(
+            check_connections, dispatch_uid='check_connections'
+        )
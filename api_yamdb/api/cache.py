@@ -0,0 +1,205 @@
+"""
+Кэш ответов на анонимные GET-запросы, ETag и версии коллекций.
+
+Каждая коллекция (произведения, жанры, отзывы к произведению и т.д.)
+имеет номер версии в кэше. Сигналы увеличивают версию при изменении
+объектов, а ключ ответа и ETag включают версии всех коллекций, из которых
+собран ответ, поэтому устаревшие ответы просто перестают совпадать.
+Версии увеличиваются после фиксации транзакции: иначе параллельный
+запрос мог бы прочитать новую версию вместе со старыми строками
+и закэшировать их под новым ключом. По той же причине не кэшируются
+и не получают ETag ответы, прочитанные из реплики: реплика может
+отставать от версий, которые уже увеличила запись в основную БД.
+"""
+from functools import partial
+from hashlib import md5
+from time import time_ns
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from api_yamdb.routers import is_reading_from_replica
+
+VERSION_KEY = 'api:version:{}'
+RESPONSE_KEY = 'api:response:{}:{}'
+GLOBAL_SCOPE = 'all'
+# Кэши, которые не видят записи других процессов.
+LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+def get_cache():
+    return caches[settings.API_CACHE['ALIAS']]
+
+
+def require_shared_cache(alias, setting):
+    """
+    Проверяет, что кэш alias общий для процессов: запись в одном
+    процессе или в команде manage.py должна быть видна остальным.
+    """
+    if isinstance(caches[alias], LOCAL_CACHES):
+        raise ImproperlyConfigured(
+            f'{setting} требует общего для процессов кэша, а кэш '
+            f'{alias!r} хранится в памяти процесса: задайте общий бэкенд '
+            f'или отключите {setting}.'
+        )
+
+
+def check_caches():
+    """Вызывается при запуске приложения."""
+    if settings.API_CACHE['ENABLED'] or settings.API_CACHE['ETAGS']:
+        require_shared_cache(settings.API_CACHE['ALIAS'], 'API_CACHE')
+    if settings.STATELESS_JWT['ENABLED']:
+        require_shared_cache(
+            settings.STATELESS_JWT['CACHE_ALIAS'], 'STATELESS_JWT'
+        )
+
+
+def get_versions(scopes):
+    """
+    Возвращает версии коллекций. Отсутствующая в кэше версия создаётся
+    со значением от текущего времени, чтобы не совпасть с прежними.
+    """
+    cache = get_cache()
+    keys = [VERSION_KEY.format(scope) for scope in (GLOBAL_SCOPE, *scopes)]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(*scopes):
+    """
+    Увеличивает версии коллекций после изменения их объектов,
+    внутри транзакции — после её фиксации.
+    """
+    transaction.on_commit(partial(bump_versions_now, scopes))
+
+
+def bump_versions_now(scopes):
+    cache = get_cache()
+    for scope in scopes:
+        key = VERSION_KEY.format(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time_ns(), timeout=None)
+
+
+def invalidate_all():
+    """Сбрасывает все ответы, например после массовой загрузки данных."""
+    bump_versions(GLOBAL_SCOPE)
+
+
+class CachedResponseMixin:
+    """
+    Условные GET-запросы и кэш ответов для GET-запросов.
+    Представление перечисляет коллекции ответа в get_cache_scopes().
+    Каждый ответ получает ETag из версий этих коллекций, и совпавший
+    If-None-Match получает 304 до выполнения запроса к БД и сериализации
+    (`*` — только после того, как ресурс найден).
+    Ответы анонимным пользователям дополнительно кэшируются.
+    Права проверяются до обращения к кэшу, в кэше хранятся данные
+    ответа, а не отрендеренный результат.
+    """
+    cache_scopes = ()
+
+    def get_cache_scopes(self):
+        return self.cache_scopes
+
+    def is_cacheable(self, request):
+        return (
+            settings.API_CACHE['ENABLED']
+            and not request.user.is_authenticated
+        )
+
+    def get_etag(self, request, versions):
+        """
+        ETag зависит от версий коллекций, адреса запроса (ссылки пагинации
+        абсолютные) и формата ответа.
+        """
+        source = '|'.join((
+            '.'.join(map(str, versions)),
+            request.build_absolute_uri(),
+            request.accepted_media_type or '',
+        ))
+        return quote_etag(md5(source.encode()).hexdigest())
+
+    def is_not_modified(self, request, etag, exists=False):
+        """
+        `*` совпадает с любым существующим ресурсом, поэтому проверяется
+        только с exists=True, когда ответ уже получен.
+        """
+        if_none_match = request.headers.get('If-None-Match')
+        if not if_none_match:
+            return False
+        etags = parse_etags(if_none_match)
+        if '*' in etags:
+            return exists
+        return etag.strip('"') in (
+            tag.replace('W/', '', 1).strip('"') for tag in etags
+        )
+
+    def not_modified_response(self, etag):
+        return Response(
+            status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag}
+        )
+
+    def add_etag(self, request, response, etag):
+        """ETag успешного ответа или 304, если ресурс совпал с `*`."""
+        if etag is None:
+            return response
+        if self.is_not_modified(request, etag, exists=True):
+            return self.not_modified_response(etag)
+        response['ETag'] = etag
+        return response
+
+    def get_response_cache_key(self, request, versions):
+        """Ссылки пагинации в данных ответа абсолютные, ключ включает хост."""
+        url = md5(request.build_absolute_uri().encode()).hexdigest()
+        return RESPONSE_KEY.format(url, '.'.join(map(str, versions)))
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if request.method != 'GET' or is_reading_from_replica() or not (
+            settings.API_CACHE['ENABLED'] or settings.API_CACHE['ETAGS']
+        ):
+            return handler(request, *args, **kwargs)
+        versions = get_versions(self.get_cache_scopes())
+        etag = None
+        if settings.API_CACHE['ETAGS']:
+            etag = self.get_etag(request, versions)
+            if self.is_not_modified(request, etag):
+                return self.not_modified_response(etag)
+        cache, key = None, None
+        if self.is_cacheable(request):
+            cache = get_cache()
+            key = self.get_response_cache_key(request, versions)
+            data = cache.get(key)
+            if data is not None:
+                return self.add_etag(request, Response(data), etag)
+        response = handler(request, *args, **kwargs)
+        if response.status_code != status.HTTP_200_OK:
+            return response
+        if cache is not None:
+            cache.set(key, response.data, settings.API_CACHE['TIMEOUT'])
+        return self.add_etag(request, response, etag)
+
+
+class CachedListMixin(CachedResponseMixin):
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+
+class CachedRetrieveMixin(CachedResponseMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
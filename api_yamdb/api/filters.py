@@ -1,6 +1,7 @@
 import django_filters as filters
 
 from reviews.models import Title
+from reviews.search import search_titles
 
 
 class TitleFilter(filters.FilterSet):
@@ -8,7 +9,11 @@ class TitleFilter(filters.FilterSet):
     category = filters.CharFilter(field_name='category__slug')
     year = filters.NumberFilter(field_name='year')
     name = filters.CharFilter(field_name='name', lookup_expr='contains')
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
         fields = '__all__'
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
@@ -0,0 +1,65 @@
+from time import perf_counter, sleep
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+INTERVAL = 1
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную БД SQLite в реплики через backup API SQLite. '
+        'Заменяет репликацию при локальной проверке чтения из реплик'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Копирует БД один раз и завершается'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=INTERVAL,
+            help='Пауза в секундах между копированиями'
+        )
+        parser.add_argument(
+            '--database',
+            action='append',
+            dest='aliases',
+            help='Реплика из settings.REPLICAS, по умолчанию все'
+        )
+
+    def replicate(self, aliases):
+        source = connections[DEFAULT_DB_ALIAS]
+        source.ensure_connection()
+        for alias in aliases:
+            target = connections[alias]
+            target.ensure_connection()
+            started = perf_counter()
+            source.connection.backup(target.connection)
+            self.stdout.write(
+                f'{alias}: скопировано за {perf_counter() - started:.2f} с'
+            )
+
+    def handle(self, *args, **options):
+        aliases = options['aliases'] or settings.REPLICAS['ALIASES']
+        if not aliases:
+            raise CommandError(
+                'Реплики не заданы, см. переменную DATABASE_REPLICAS.'
+            )
+        unknown = set(aliases) - set(settings.REPLICAS['ALIASES'])
+        if unknown:
+            raise CommandError(
+                f'Реплики не найдены: {", ".join(sorted(unknown))}.'
+            )
+        if any(connections[alias].vendor != 'sqlite'
+               for alias in (DEFAULT_DB_ALIAS, *aliases)):
+            raise CommandError('Команда копирует только БД SQLite.')
+        while True:
+            self.replicate(aliases)
+            if options['once']:
+                break
+            sleep(options['interval'])
@@ -0,0 +1,202 @@
+"""
+Метрики приложения в текстовом формате Prometheus.
+
+Каждый поток пишет в собственный шард значений, поэтому обновление метрики
+не берёт блокировку: блокировка нужна только при появлении нового потока.
+При чтении шарды суммируются. Метрики живут в памяти процесса,
+каждый воркер gunicorn отдаёт свои значения.
+"""
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+QUERY_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def escape_label_value(value):
+    return (
+        str(value).replace('\\', r'\\').replace('"', r'\"')
+        .replace('\n', r'\n')
+    )
+
+
+def format_labels(labelnames, values, extra=()):
+    pairs = [
+        f'{name}="{escape_label_value(value)}"'
+        for name, value in (*zip(labelnames, values), *extra)
+    ]
+    return '{%s}' % ','.join(pairs) if pairs else ''
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Metric:
+    """Метрика с шардами значений по потокам."""
+    type = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            return shard
+
+    def _snapshots(self):
+        with self._shards_lock:
+            shards = list(self._shards)
+        # Копия словаря в CPython делается под GIL целиком,
+        # поэтому читать шард другого потока без блокировки безопасно.
+        return [dict(shard) for shard in shards]
+
+    def _check_labels(self, labels):
+        labels = tuple(labels)
+        if len(labels) != len(self.labelnames):
+            raise ValueError(
+                f'Метрика {self.name} ожидает метки {self.labelnames}'
+            )
+        return labels
+
+    def render(self):
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.type}',
+        ]
+        lines.extend(self.render_samples())
+        return lines
+
+    def render_samples(self):
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, labels=(), amount=1):
+        labels = self._check_labels(labels)
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def collect(self):
+        totals = defaultdict(int)
+        for shard in self._snapshots():
+            for labels, value in shard.items():
+                totals[labels] += value
+        return dict(totals)
+
+    def render_samples(self):
+        for labels, value in sorted(self.collect().items()):
+            yield (
+                f'{self.name}{format_labels(self.labelnames, labels)} '
+                f'{format_value(value)}'
+            )
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(),
+                 buckets=DEFAULT_BUCKETS, registry=None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value, labels=()):
+        labels = self._check_labels(labels)
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            # Счётчики корзин (последняя — +Inf), сумма, количество.
+            state = shard[labels] = [0] * (len(self.buckets) + 1) + [0, 0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-2] += value
+        state[-1] += 1
+
+    def collect(self):
+        totals = {}
+        for shard in self._snapshots():
+            for labels, state in shard.items():
+                state = list(state)
+                total = totals.setdefault(labels, [0] * len(state))
+                for index, value in enumerate(state):
+                    total[index] += value
+        return totals
+
+    def render_samples(self):
+        bounds = (*self.buckets, float('inf'))
+        for labels, state in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(bounds, state):
+                cumulative += count
+                label_text = format_labels(
+                    self.labelnames, labels, (('le', format_value(bound)),)
+                )
+                yield f'{self.name}_bucket{label_text} {cumulative}'
+            label_text = format_labels(self.labelnames, labels)
+            yield f'{self.name}_sum{label_text} {format_value(state[-2])}'
+            yield f'{self.name}_count{label_text} {state[-1]}'
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+REQUEST_LABELS = ('view', 'action', 'method', 'status')
+
+requests_total = Counter(
+    'api_requests_total',
+    'Количество обработанных запросов.',
+    REQUEST_LABELS
+)
+request_duration = Histogram(
+    'api_request_duration_seconds',
+    'Время обработки запроса в секундах.',
+    REQUEST_LABELS
+)
+request_queries = Histogram(
+    'api_request_db_queries',
+    'Количество запросов к БД на один запрос к API.',
+    ('view', 'action'),
+    buckets=QUERY_BUCKETS
+)
+db_lock_retries_total = Counter(
+    'api_db_lock_retries_total',
+    'Количество повторов изменяющих запросов из-за блокировки БД.',
+    ('view', 'action')
+)
+db_lock_giveups_total = Counter(
+    'api_db_lock_giveups_total',
+    'Количество изменяющих запросов, не выполненных из-за блокировки БД.',
+    ('view', 'action')
+)
@@ -0,0 +1,213 @@
+import logging
+from contextlib import ExitStack, contextmanager
+from time import perf_counter
+
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.middleware.clickjacking import XFrameOptionsMiddleware
+from django.middleware.csrf import CsrfViewMiddleware
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api_yamdb.routers import replica_reads
+from . import metrics
+from .cache import get_cache, require_shared_cache
+
+logger = logging.getLogger('api.performance')
+API_PREFIX = '/api/'
+STICKY_KEY = 'db:sticky:{}'
+
+
+class QueryCounter:
+    """
+    Обёртка выполнения запросов: считает запросы и время SQL,
+    не сохраняя ни текст, ни параметры запросов.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += perf_counter() - started
+            self.count += 1
+
+    @contextmanager
+    def watch(self):
+        """Подключает счётчик ко всем соединениям с БД."""
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(
+                    connections[alias].execute_wrapper(self)
+                )
+            yield self
+
+
+class QueryStatsMiddleware:
+    """
+    Считает запросы к БД и время SQL за запрос, отдаёт их в заголовке
+    Server-Timing и пишет в лог запросы, превысившие бюджет.
+    Выключенный через настройки QUERY_STATS, не встраивается в цепочку.
+    """
+
+    def __init__(self, get_response):
+        config = settings.QUERY_STATS
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.max_queries = config['MAX_QUERIES']
+        self.max_sql_time = config['MAX_SQL_TIME_MS'] / 1000
+
+    def __call__(self, request):
+        started = perf_counter()
+        with QueryCounter().watch() as counter:
+            request.query_stats = counter
+            response = self.get_response(request)
+        duration = perf_counter() - started
+        response['Server-Timing'] = (
+            f'db;dur={counter.duration * 1000:.1f};'
+            f'desc="{counter.count} queries", '
+            f'app;dur={duration * 1000:.1f}'
+        )
+        if (
+            counter.count > self.max_queries
+            or counter.duration > self.max_sql_time
+        ):
+            logger.warning(
+                'Превышен бюджет запросов к БД: %s %s — %d запросов, '
+                'SQL %.1f мс, всего %.1f мс',
+                request.method, request.path, counter.count,
+                counter.duration * 1000, duration * 1000
+            )
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Собирает количество запросов, гистограммы времени ответа и числа
+    запросов к БД по представлению, действию и статусу ответа.
+    Счётчик запросов к БД берётся у QueryStatsMiddleware, если она включена.
+    """
+
+    def __init__(self, get_response):
+        if not settings.METRICS['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = perf_counter()
+        counter = getattr(request, 'query_stats', None)
+        if counter is None:
+            with QueryCounter().watch() as counter:
+                response = self.get_response(request)
+        else:
+            response = self.get_response(request)
+        duration = perf_counter() - started
+        view, action = getattr(
+            request, 'metrics_view', ('unresolved', 'unresolved')
+        )
+        labels = (view, action, request.method, response.status_code)
+        metrics.requests_total.inc(labels)
+        metrics.request_duration.observe(duration, labels)
+        metrics.request_queries.observe(counter.count, (view, action))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None)
+        view = view_class.__name__ if view_class else view_func.__name__
+        actions = getattr(view_func, 'actions', None) or {}
+        action = actions.get(request.method.lower(), request.method.lower())
+        request.metrics_view = (view, action)
+
+
+def get_token_user_id(request):
+    """id пользователя из JWT-токена запроса без обращения к БД."""
+    parts = request.headers.get('Authorization', '').split()
+    if len(parts) != 2 or parts[0] not in jwt_settings.AUTH_HEADER_TYPES:
+        return None
+    try:
+        return AccessToken(parts[1]).get(jwt_settings.USER_ID_CLAIM)
+    except TokenError:
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Безопасные запросы к API читают из реплик. После успешного
+    изменяющего запроса пользователь STICKY_SECONDS секунд читает
+    из основной БД, чтобы видеть свои изменения, пока реплика отстаёт.
+    Отметки об этом хранятся в кэше, общем для всех процессов сервера.
+    Без реплик в settings.REPLICAS не встраивается в цепочку.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REPLICAS['ALIASES']:
+            raise MiddlewareNotUsed
+        require_shared_cache(settings.API_CACHE['ALIAS'], 'DATABASE_REPLICAS')
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not request.path.startswith(API_PREFIX):
+            return self.get_response(request)
+        user_id = get_token_user_id(request)
+        sticky_key = STICKY_KEY.format(user_id)
+        if request.method not in SAFE_METHODS:
+            response = self.get_response(request)
+            if user_id is not None and response.status_code < 400:
+                get_cache().set(
+                    sticky_key, True, settings.REPLICAS['STICKY_SECONDS']
+                )
+            return response
+        if user_id is not None and get_cache().get(sticky_key):
+            return self.get_response(request)
+        with replica_reads():
+            return self.get_response(request)
+
+
+class SiteOnlyMixin:
+    """
+    Пропускает middleware для запросов к API: API аутентифицирует
+    по JWT и не использует сессии, сообщения, CSRF-cookie и X-Frame-Options.
+    Для админки и остальных страниц middleware работает как обычно.
+    """
+
+    def __call__(self, request):
+        if request.path.startswith(API_PREFIX):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class SiteSessionMiddleware(SiteOnlyMixin, SessionMiddleware):
+    pass
+
+
+class SiteCsrfViewMiddleware(SiteOnlyMixin, CsrfViewMiddleware):
+
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        if request.path.startswith(API_PREFIX):
+            return None
+        return super().process_view(
+            request, callback, callback_args, callback_kwargs
+        )
+
+
+class SiteAuthenticationMiddleware(SiteOnlyMixin, AuthenticationMiddleware):
+    pass
+
+
+class SiteMessageMiddleware(SiteOnlyMixin, MessageMiddleware):
+    pass
+
+
+class SiteXFrameOptionsMiddleware(SiteOnlyMixin, XFrameOptionsMiddleware):
+    pass
@@ -1,7 +1,33 @@
+from functools import partial
+
 from rest_framework import mixins, viewsets
 
+from .retry import call_with_retry
+
+
+class LockRetryMixin:
+    """
+    Выполняет обработчики изменяющих запросов в транзакции с повтором
+    при блокировке БД, см. api/retry.py.
+    """
+    retry_methods = ('post', 'put', 'patch', 'delete')
+
+    def dispatch(self, request, *args, **kwargs):
+        method = request.method.lower()
+        handler = getattr(self, method, None)
+        if method in self.retry_methods and handler is not None:
+            setattr(self, method, partial(self.call_with_retry, handler))
+        return super().dispatch(request, *args, **kwargs)
+
+    def call_with_retry(self, handler, request, *args, **kwargs):
+        return call_with_retry(
+            handler, request, *args,
+            labels=(type(self).__name__, self.action), **kwargs
+        )
+
 
 class ListCreateDestroyViewSet(
+    LockRetryMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
@@ -0,0 +1,208 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from functools import reduce
+from operator import and_, or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+MAX_KEYSET_LIMIT = 1000
+
+
+class KeysetPagination(BasePagination):
+    """
+    Пагинация по ключам сортировки (keyset/seek).
+    Следующая страница выбирается условием
+    `(pub_date, id) > (<последний pub_date>, <последний id>)` вместо OFFSET,
+    а общее количество объектов не считается.
+    Ключи сортировки берутся из атрибута `keyset_ordering` представления,
+    последним ключом должно быть уникальное поле.
+    """
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    default_limit = api_settings.PAGE_SIZE
+    max_limit = MAX_KEYSET_LIMIT
+    invalid_cursor_message = 'Неверный курсор.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = tuple(view.keyset_ordering)
+        self.limit = self.get_limit(request)
+        position, self.reverse = self.decode_cursor(request)
+        self.has_cursor = position is not None
+        if self.has_cursor:
+            position = self.parse_position(queryset.model, position)
+
+        ordering = self.ordering
+        if self.reverse:
+            ordering = tuple(map(self.invert_ordering, ordering))
+        queryset = queryset.order_by(*ordering)
+        if self.has_cursor:
+            queryset = queryset.filter(
+                self.get_seek_filter(ordering, position)
+            )
+
+        results = list(queryset[:self.limit + 1])
+        has_more = len(results) > self.limit
+        results = results[:self.limit]
+        if self.reverse:
+            results.reverse()
+            self.has_next, self.has_previous = self.has_cursor, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.has_cursor
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+        if limit <= 0:
+            return self.default_limit
+        return min(limit, self.max_limit)
+
+    @staticmethod
+    def invert_ordering(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def get_seek_filter(ordering, position):
+        """
+        Строит условие строки, идущей после position в порядке ordering:
+        (a > x) OR (a = x AND b > y) OR ...
+        """
+        conditions = []
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equal = [
+                Q(**{previous.lstrip('-'): value})
+                for previous, value in zip(ordering[:index], position)
+            ]
+            after = Q(**{f'{name}__{lookup}': position[index]})
+            conditions.append(reduce(and_, equal, after))
+        return reduce(or_, conditions)
+
+    def get_position(self, obj):
+        position = []
+        for field in self.ordering:
+            value = getattr(obj, field.lstrip('-'))
+            if hasattr(value, 'isoformat'):
+                value = value.isoformat()
+            position.append(value)
+        return position
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            position, reverse = cursor['p'], bool(cursor.get('r'))
+        except (TypeError, KeyError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or (
+            len(position) != len(self.ordering)
+        ) or any(isinstance(value, (list, dict)) for value in position):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def parse_position(self, model, position):
+        """Приводит значения курсора к типам полей сортировки."""
+        try:
+            position = [
+                model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if None in position:
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def encode_cursor(self, position, reverse):
+        cursor = {'p': position}
+        if reverse:
+            cursor['r'] = 1
+        encoded = urlsafe_b64encode(
+            json.dumps(cursor, separators=(',', ':')).encode()
+        ).decode('ascii')
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            url = self.request.build_absolute_uri()
+            return remove_query_param(url, self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[0]), True)
+
+
+class LimitOffsetOrKeysetPagination(LimitOffsetPagination):
+    """
+    Пагинация limit/offset по умолчанию.
+    Запрос с параметром `pagination=cursor` или `cursor` переключается на
+    KeysetPagination, если у представления задан `keyset_ordering`.
+    """
+    mode_query_param = 'pagination'
+    keyset_mode = 'cursor'
+    keyset_class = KeysetPagination
+
+    def __init__(self):
+        self.keyset = None
+
+    def is_keyset_request(self, request, view):
+        if getattr(view, 'keyset_ordering', None) is None:
+            return False
+        return (
+            request.query_params.get(self.mode_query_param)
+            == self.keyset_mode
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_keyset_request(request, view):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_html_context(self):
+        if self.keyset is not None:
+            return {}
+        return super().get_html_context()
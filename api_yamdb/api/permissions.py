@@ -42,7 +42,7 @@ class IsAuthorOrModeratorOrAdmin(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.user.is_authenticated:
             return (
-                request.user == obj.author
+                obj.author_id == request.user.id
                 or request.user.is_moderator
                 or request.user.is_admin
             )
@@ -0,0 +1,105 @@
+"""
+Повтор изменяющих запросов при блокировке SQLite.
+
+busy_timeout (см. api_yamdb/db.py) не помогает, когда транзакция,
+начавшая с чтения, пытается писать после чужой записи: SQLite сразу
+возвращает «database is locked». Такую транзакцию можно только
+откатить и выполнить заново, поэтому действие целиком выполняется
+в transaction.atomic и повторяется с растущей случайной задержкой.
+Если попытки кончились, клиент получает 503 с заголовком Retry-After.
+
+С DB_LOCK_RETRY['TRANSACTION_MODE'] = 'IMMEDIATE' повторяемые транзакции
+начинаются с BEGIN IMMEDIATE: блокировка записи берётся сразу и ждёт
+busy_timeout, и повторов почти не бывает. Остальные транзакции, в том
+числе читающие, начинаются обычным BEGIN и блокировку записи не берут.
+"""
+import random
+from contextvars import ContextVar
+from functools import partial
+from time import sleep
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from . import metrics
+
+
+transaction_mode = ContextVar('transaction_mode', default='')
+
+
+def begin_transaction(connection):
+    mode = transaction_mode.get()
+    connection.cursor().execute(f'BEGIN {mode}' if mode else 'BEGIN')
+
+
+def configure_transaction_mode(sender, connection, **kwargs):
+    """
+    Приёмник сигнала connection_created. Заменяет приватный метод
+    Django 3.2 DatabaseWrapper._start_transaction_under_autocommit,
+    которым бэкенд SQLite начинает транзакцию командой BEGIN; при
+    обновлении Django замену нужно проверить.
+    """
+    if (
+        connection.vendor == 'sqlite'
+        and settings.DB_LOCK_RETRY['TRANSACTION_MODE']
+    ):
+        connection._start_transaction_under_autocommit = partial(
+            begin_transaction, connection
+        )
+
+
+class DatabaseBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'База данных занята, повторите запрос позже.'
+    default_code = 'database_busy'
+    # Секунды для заголовка Retry-After.
+    wait = 1
+
+
+def is_database_locked(error):
+    return 'locked' in str(error)
+
+
+def get_backoff(attempt):
+    """Задержка в секундах перед повтором: случайная до 2^attempt шагов."""
+    config = settings.DB_LOCK_RETRY
+    limit = min(
+        config['BACKOFF_MS'] * 2 ** attempt, config['MAX_BACKOFF_MS']
+    )
+    return random.uniform(0, limit) / 1000
+
+
+def call_with_retry(func, *args, labels=(), **kwargs):
+    """
+    Выполняет func в транзакции и повторяет её при блокировке БД.
+    Внутри уже открытой транзакции повтор невозможен, func вызывается
+    как есть. labels — метки метрик повторов (представление, действие).
+    """
+    config = settings.DB_LOCK_RETRY
+    if not config['ENABLED'] or connection.in_atomic_block:
+        return func(*args, **kwargs)
+    token = transaction_mode.set(config['TRANSACTION_MODE'])
+    try:
+        return retry(func, args, kwargs, labels)
+    finally:
+        transaction_mode.reset(token)
+
+
+def retry(func, args, kwargs, labels):
+    config = settings.DB_LOCK_RETRY
+    attempt = 1
+    while True:
+        try:
+            with transaction.atomic():
+                return func(*args, **kwargs)
+        except OperationalError as error:
+            if not is_database_locked(error):
+                raise
+            if attempt >= config['ATTEMPTS']:
+                metrics.db_lock_giveups_total.inc(labels)
+                raise DatabaseBusy from error
+            metrics.db_lock_retries_total.inc(labels)
+            sleep(get_backoff(attempt))
+            attempt += 1
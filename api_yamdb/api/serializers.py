@@ -1,6 +1,5 @@
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 
 from reviews.models import Comment, Review, Category, Genre, Title
@@ -28,11 +27,10 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         request = self.context['request']
-        title_id = self.context['view'].kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
         if request.method == 'POST':
-            if title.reviews.filter(
-                    author=request.user).exists():
+            title_id = self.context['view'].get_title_id()
+            if Review.objects.filter(
+                    title_id=title_id, author_id=request.user.id).exists():
                 raise ValidationError('Можно оставлять только один'
                                       'отзыв на произведение.')
         return data
@@ -81,7 +79,9 @@ class TitlesReadSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        fields = (
+            'id', 'name', 'year', 'rating', 'description', 'genre', 'category'
+        )
 
 
 class TitlesEditorSerializer(serializers.ModelSerializer):
@@ -97,4 +97,4 @@ class TitlesEditorSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        fields = ('id', 'name', 'year', 'description', 'genre', 'category')
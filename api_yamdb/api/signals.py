@@ -0,0 +1,56 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from .cache import bump_versions
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Title)
+@receiver(m2m_changed, sender=Title.genre.through)
+def bump_titles(sender, **kwargs):
+    bump_versions('titles')
+
+
+@receiver(post_delete, sender=Title)
+def bump_deleted_title(sender, instance, **kwargs):
+    bump_versions('titles', f'reviews:{instance.pk}')
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def bump_genres(sender, **kwargs):
+    bump_versions('genres')
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def bump_categories(sender, **kwargs):
+    bump_versions('categories')
+
+
+@receiver(post_save, sender=Review)
+def bump_reviews(sender, instance, **kwargs):
+    bump_versions('titles', f'reviews:{instance.title_id}')
+
+
+@receiver(post_delete, sender=Review)
+def bump_deleted_review(sender, instance, **kwargs):
+    bump_versions(
+        'titles', f'reviews:{instance.title_id}', f'comments:{instance.pk}'
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_comments(sender, instance, **kwargs):
+    bump_versions(f'comments:{instance.review_id}')
+
+
+@receiver(post_save, sender=User)
+def bump_authors(sender, instance, created, **kwargs):
+    """Имя автора выводится в отзывах и комментариях."""
+    if not created and instance.username_changed():
+        bump_versions('authors')
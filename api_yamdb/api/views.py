@@ -1,12 +1,14 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.shortcuts import get_object_or_404
-from django.db.models import Avg
+from django.http import Http404, HttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, permissions, viewsets
 
-from reviews.models import Title, Review, Category, Genre, Title
+from reviews.models import Category, Comment, Genre, Review, Title
+from . import metrics
+from .cache import CachedListMixin, CachedRetrieveMixin
 from .filters import TitleFilter
-from .mixins import ListCreateDestroyViewSet
+from .mixins import ListCreateDestroyViewSet, LockRetryMixin
 from .permissions import IsAdminOrReadOnly, IsAuthorOrModeratorOrAdmin
 from .serializers import (
     CommentSerializer,
@@ -20,9 +22,14 @@ from .serializers import (
 User = get_user_model()
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(LockRetryMixin, CachedListMixin, CachedRetrieveMixin,
+                    viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     http_method_names = ['get', 'post', 'patch', 'delete', ]
+    keyset_ordering = ('pub_date', 'id')
+
+    def get_cache_scopes(self):
+        return (f'reviews:{self.kwargs.get("title_id")}', 'authors')
 
     def get_permissions(self):
         if self.action == 'create':
@@ -31,21 +38,39 @@ class ReviewViewSet(viewsets.ModelViewSet):
             return [IsAuthorOrModeratorOrAdmin()]
         return [permissions.IsAuthenticatedOrReadOnly()]
 
-    def get_title(self):
-        return get_object_or_404(Title, id=self.kwargs.get('title_id'))
+    checked_title_id = None
+
+    def get_title_id(self):
+        """
+        Проверяет, что произведение существует, не загружая его.
+        Проверка выполняется один раз за запрос.
+        """
+        if self.checked_title_id is None:
+            title_id = int(self.kwargs['title_id'])
+            if not Title.objects.filter(id=title_id).exists():
+                raise Http404
+            self.checked_title_id = title_id
+        return self.checked_title_id
 
     def get_queryset(self):
-        title = self.get_title()
-        return title.reviews.all()
+        return Review.objects.filter(
+            title_id=self.get_title_id()
+        ).select_related('author')
 
     def perform_create(self, serializer):
-        title = self.get_title()
-        serializer.save(author=self.request.user, title=title)
+        serializer.save(
+            author_id=self.request.user.id, title_id=self.get_title_id()
+        )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(LockRetryMixin, CachedListMixin, CachedRetrieveMixin,
+                     viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     http_method_names = ['get', 'post', 'patch', 'delete', ]
+    keyset_ordering = ('pub_date', 'id')
+
+    def get_cache_scopes(self):
+        return (f'comments:{self.kwargs.get("review_id")}', 'authors')
 
     def get_permissions(self):
         if self.action == 'create':
@@ -54,44 +79,83 @@ class CommentViewSet(viewsets.ModelViewSet):
             return [IsAuthorOrModeratorOrAdmin()]
         return [permissions.IsAuthenticatedOrReadOnly()]
 
-    def get_review(self):
-        return get_object_or_404(Review, id=self.kwargs.get('review_id'))
+    checked_review_id = None
+
+    def get_review_id(self):
+        """
+        Проверяет, что отзыв существует, не загружая его.
+        Проверка выполняется один раз за запрос.
+        """
+        if self.checked_review_id is None:
+            review_id = int(self.kwargs['review_id'])
+            if not Review.objects.filter(id=review_id).exists():
+                raise Http404
+            self.checked_review_id = review_id
+        return self.checked_review_id
 
     def get_queryset(self):
-        review = self.get_review()
-        return review.comments.all()
+        return Comment.objects.filter(
+            review_id=self.get_review_id()
+        ).select_related('author')
 
     def perform_create(self, serializer):
-        review = self.get_review()
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(
+            author_id=self.request.user.id, review_id=self.get_review_id()
+        )
 
 
-class CategoryViewSet(ListCreateDestroyViewSet):
+class CategoryViewSet(CachedListMixin, ListCreateDestroyViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
+    cache_scopes = ('categories',)
 
 
-class GenreViewSet(ListCreateDestroyViewSet):
+class GenreViewSet(CachedListMixin, ListCreateDestroyViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
+    cache_scopes = ('genres',)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(rating=Avg('reviews__score'))
+class TitleViewSet(LockRetryMixin, CachedListMixin, CachedRetrieveMixin,
+                   viewsets.ModelViewSet):
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre')
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
     http_method_names = ['get', 'post', 'patch', 'delete']
+    cache_scopes = ('titles', 'genres', 'categories')
+
+    @property
+    def keyset_ordering(self):
+        """
+        Результаты поиска упорядочены по релевантности, а курсор
+        требует сортировки по полям, поэтому поиск всегда
+        использует limit/offset.
+        """
+        if self.request.query_params.get('search'):
+            return None
+        return ('name', 'id')
 
     def get_serializer_class(self):
         if self.request.method in ['POST', 'PATCH']:
             return TitlesEditorSerializer
         return TitlesReadSerializer
+
+
+def metrics_view(request):
+    """Отдаёт метрики процесса в текстовом формате Prometheus."""
+    if not settings.METRICS['ENABLED']:
+        raise Http404
+    return HttpResponse(
+        metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE
+    )
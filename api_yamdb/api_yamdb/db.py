@@ -0,0 +1,37 @@
+"""
+Настройка соединений с SQLite.
+
+PRAGMA из settings.SQLITE['PRAGMAS'] выполняются для каждого нового
+соединения. WAL позволяет читать во время записи, busy_timeout
+заставляет ждать освобождения блокировки вместо ошибки
+«database is locked», synchronous=NORMAL в режиме WAL не теряет
+целостность БД при сбое процесса.
+
+При CONN_MAX_AGE больше нуля соединение потока переживает запрос.
+Перед повторным использованием check_connections проверяет соединения
+методом is_usable() бэкенда и закрывает неработающие, следующий запрос
+к БД откроет новое. Для SQLite is_usable() всегда истинен, проверка
+нужна серверным БД, которые могут закрыть простаивающее соединение.
+"""
+from django.conf import settings
+from django.db import connections
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """Приёмник сигнала connection_created."""
+    if connection.vendor != 'sqlite' or not settings.SQLITE['ENABLED']:
+        return
+    # Запросы выполняются мимо обёрток Django, чтобы не попадать
+    # в счётчики запросов к БД.
+    for name, value in settings.SQLITE['PRAGMAS'].items():
+        if value is not None:
+            connection.connection.execute(f'PRAGMA {name} = {value}')
+
+
+def check_connections(sender, **kwargs):
+    """Приёмник сигнала request_started."""
+    if not settings.DATABASE_HEALTH_CHECKS:
+        return
+    for connection in connections.all():
+        if connection.connection is not None and not connection.is_usable():
+            connection.close()
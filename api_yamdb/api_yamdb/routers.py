@@ -0,0 +1,54 @@
+"""
+Маршрутизация запросов к БД между основной БД и репликами.
+
+Запись всегда идёт в основную БД `default`. Чтение идёт в случайную
+реплику из settings.REPLICAS['ALIASES'] только внутри replica_reads():
+его включает ReplicaRoutingMiddleware для безопасных запросов к API.
+Команды, shell и изменяющие запросы читают из основной БД.
+Пользователи всегда читаются из основной БД: по ним аутентификация
+проверяет роль и активность владельца токена, и отстающая реплика
+вернула бы прежнюю роль или не нашла бы нового пользователя.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+read_from_replica = ContextVar('read_from_replica', default=False)
+
+
+@contextmanager
+def replica_reads():
+    token = read_from_replica.set(True)
+    try:
+        yield
+    finally:
+        read_from_replica.reset(token)
+
+
+def is_reading_from_replica():
+    return bool(settings.REPLICAS['ALIASES']) and read_from_replica.get()
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if (
+            is_reading_from_replica()
+            and model._meta.label != settings.AUTH_USER_MODEL
+        ):
+            return random.choice(settings.REPLICAS['ALIASES'])
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """В репликах те же данные, что в основной БД."""
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        """Схема попадает в реплики вместе с данными."""
+        return db == DEFAULT_DB_ALIAS
@@ -1,3 +1,5 @@
+import os
+import sys
 from datetime import timedelta
 from pathlib import Path
 
@@ -31,12 +33,17 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'api.middleware.QueryStatsMiddleware',
+    'api.middleware.MetricsMiddleware',
+    'api.middleware.ReplicaRoutingMiddleware',
+    # Сессии, CSRF, сообщения и X-Frame-Options нужны только админке,
+    # запросы к /api/ их пропускают.
+    'api.middleware.SiteSessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.SiteCsrfViewMiddleware',
+    'api.middleware.SiteAuthenticationMiddleware',
+    'api.middleware.SiteMessageMiddleware',
+    'api.middleware.SiteXFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'api_yamdb.urls'
@@ -70,6 +77,105 @@ DATABASES = {
     }
 }
 
+# Реплики для чтения: пути к файлам SQLite через запятую. Локально
+# реплики обновляет команда replicate_db. В тестах реплики совпадают
+# с основной БД.
+REPLICA_ALIASES = []
+for number, name in enumerate(
+    filter(None, os.getenv('DATABASE_REPLICAS', '').split(',')), 1
+):
+    REPLICA_ALIASES.append(f'replica{number}')
+    DATABASES[f'replica{number}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name,
+        'TEST': {'MIRROR': 'default'},
+    }
+
+# Сколько секунд поток держит соединение с БД между запросами,
+# 0 — новое соединение на каждый запрос. Перед повторным использованием
+# соединения проверяются, см. api_yamdb/db.py.
+CONN_MAX_AGE = int(os.getenv('DATABASE_CONN_MAX_AGE', 60))
+for database in DATABASES.values():
+    database['CONN_MAX_AGE'] = CONN_MAX_AGE
+
+DATABASE_HEALTH_CHECKS = (
+    os.getenv('DATABASE_HEALTH_CHECKS', 'True') == 'True'
+)
+
+DATABASE_ROUTERS = ['api_yamdb.routers.ReplicaRouter']
+
+REPLICAS = {
+    'ALIASES': tuple(REPLICA_ALIASES),
+    # Сколько секунд после записи пользователь читает из основной БД.
+    'STICKY_SECONDS': int(os.getenv('REPLICA_STICKY_SECONDS', 10)),
+}
+
+# PRAGMA для каждого нового соединения с SQLite, см. api_yamdb/db.py.
+# Значение None оставляет настройку SQLite по умолчанию.
+SQLITE = {
+    'ENABLED': os.getenv('SQLITE_TUNING_ENABLED', 'True') == 'True',
+    'PRAGMAS': {
+        # busy_timeout первым: смена journal_mode ждёт блокировку.
+        'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+        'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+        # Отрицательное значение задаёт размер кэша в КиБ.
+        'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', -64 * 1024)),
+        'temp_store': os.getenv('SQLITE_TEMP_STORE', 'MEMORY'),
+    },
+}
+
+
+# Повтор изменяющих запросов при «database is locked», см. api/retry.py.
+DB_LOCK_RETRY = {
+    'ENABLED': os.getenv('DB_LOCK_RETRY_ENABLED', 'True') == 'True',
+    'ATTEMPTS': int(os.getenv('DB_LOCK_RETRY_ATTEMPTS', 5)),
+    'BACKOFF_MS': int(os.getenv('DB_LOCK_RETRY_BACKOFF_MS', 20)),
+    'MAX_BACKOFF_MS': int(os.getenv('DB_LOCK_RETRY_MAX_BACKOFF_MS', 500)),
+    # Режим BEGIN для транзакций повторяемых запросов к SQLite:
+    # IMMEDIATE или EXCLUSIVE, пустая строка — обычный BEGIN Django.
+    'TRANSACTION_MODE': os.getenv('DB_LOCK_RETRY_TRANSACTION_MODE', ''),
+}
+
+
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'api_yamdb'),
+    },
+    # Отметки отзыва токенов хранятся отдельно от ответов API,
+    # чтобы те их не вытесняли, и не вытесняются вовсе.
+    'tokens': {
+        'BACKEND': os.getenv(
+            'TOKEN_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('TOKEN_CACHE_LOCATION', 'api_yamdb-tokens'),
+        'OPTIONS': {'MAX_ENTRIES': sys.maxsize},
+    },
+}
+
+# Бэкенды кэша, которые не видят записей других процессов.
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+# Версии коллекций должны быть общими для всех процессов, поэтому
+# по умолчанию кэш ответов и ETag включены только с общим бэкендом.
+SHARED_CACHE = str(CACHES['default']['BACKEND'] not in LOCAL_CACHE_BACKENDS)
+
+API_CACHE = {
+    'ENABLED': os.getenv('API_CACHE_ENABLED', SHARED_CACHE) == 'True',
+    'ALIAS': 'default',
+    'TIMEOUT': int(os.getenv('API_CACHE_TIMEOUT', 300)),
+    'ETAGS': os.getenv('API_ETAGS_ENABLED', SHARED_CACHE) == 'True',
+}
+
 
 # Password validation
 
@@ -115,14 +221,24 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
 }
 
+# Отметки отзыва токенов должны быть видны всем процессам, поэтому
+# по умолчанию токены без запроса к БД включены только с общим кэшем.
+STATELESS_JWT = {
+    'ENABLED': os.getenv(
+        'STATELESS_JWT_ENABLED',
+        str(CACHES['tokens']['BACKEND'] not in LOCAL_CACHE_BACKENDS)
+    ) == 'True',
+    'CACHE_ALIAS': 'tokens',
+}
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.StatelessJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.LimitOffsetOrKeysetPagination',
     'PAGE_SIZE': 5,
 }
 
@@ -131,3 +247,22 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
 EMAIL_HOST_USER = 'admin@api_yamdb.ru'
+
+EMAIL_OUTBOX = {
+    'EAGER': os.getenv('EMAIL_OUTBOX_EAGER', 'False') == 'True',
+    'MAX_ATTEMPTS': int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', 8)),
+    'BACKOFF_SECONDS': int(os.getenv('EMAIL_OUTBOX_BACKOFF_SECONDS', 30)),
+    'MAX_BACKOFF_SECONDS': 3600,
+}
+
+# Per-request DB instrumentation
+
+QUERY_STATS = {
+    'ENABLED': os.getenv('QUERY_STATS_ENABLED', 'True') == 'True',
+    'MAX_QUERIES': int(os.getenv('QUERY_STATS_MAX_QUERIES', 20)),
+    'MAX_SQL_TIME_MS': float(os.getenv('QUERY_STATS_MAX_SQL_TIME_MS', 200)),
+}
+
+METRICS = {
+    'ENABLED': os.getenv('METRICS_ENABLED', 'True') == 'True',
+}
@@ -2,6 +2,8 @@ from django.contrib import admin
 from django.urls import include, path
 from django.views.generic import TemplateView
 
+from api.views import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path(
@@ -11,4 +13,5 @@ urlpatterns = [
     ),
     path('api/', include('api.urls')),
     path('api/', include('users.urls')),
+    path('metrics', metrics_view, name='metrics'),
 ]
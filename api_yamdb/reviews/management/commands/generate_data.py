@@ -0,0 +1,307 @@
+import random
+from datetime import timedelta
+from itertools import accumulate
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection
+from django.db.models import Max
+from django.utils import timezone
+
+from api.cache import invalidate_all
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.ratings import recalculate_ratings
+from users.models import CustomUser
+from .load_csv import BATCH_SIZE, del_data, insert_rows
+
+# Сколько жанров у произведения и с какой вероятностью.
+GENRE_FANOUT = (1, 2, 3, 4)
+GENRE_FANOUT_WEIGHTS = (50, 30, 15, 5)
+# Оценки смещены к высоким, как в реальных отзывах.
+SCORES = range(1, 11)
+SCORE_WEIGHTS = (2, 1, 2, 3, 5, 8, 13, 18, 22, 26)
+FIRST_YEAR = 1900
+PUBLICATION_PERIOD = timedelta(days=5 * 365)
+TEXT_POOL_SIZE = 1000
+WORDS = (
+    'тёмный', 'город', 'последний', 'дом', 'лето', 'дорога', 'песня',
+    'тайна', 'ночь', 'море', 'звезда', 'война', 'сад', 'время', 'огонь',
+)
+MODELS = (CustomUser, Category, Genre, Title, Review, Comment)
+
+
+def zipf_cum_weights(size, alpha):
+    """Накопленные веса закона Ципфа: вес элемента ранга k равен 1/k^alpha"""
+    return list(accumulate(1 / rank ** alpha for rank in range(1, size + 1)))
+
+
+def power_law_counts(seed, items, total, alpha, cap):
+    """
+    Лениво выдаёт для каждого из items элементов число дочерних объектов
+    по распределению Парето, в сумме total. Первый проход считает сумму
+    выборки, второй повторяет ту же выборку и нормирует её, поэтому
+    память не зависит от items. Число ограничено cap, из-за этого итог
+    может оказаться меньше total.
+    """
+    rng = random.Random(seed)
+    draws_sum = sum(rng.paretovariate(alpha) for _ in range(items))
+    rng.seed(seed)
+    scale = total / draws_sum if draws_sum else 0
+    cumulative = previous = 0
+    for _ in range(items):
+        cumulative += rng.paretovariate(alpha) * scale
+        amount = round(cumulative) - previous
+        previous += amount
+        yield min(amount, cap)
+
+
+def get_next_id(model):
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+def make_texts(rng, min_words, max_words):
+    """Набор текстов, из которого строки берут значения."""
+    return [
+        ' '.join(rng.choices(WORDS, k=rng.randint(min_words, max_words)))
+        .capitalize()
+        for _ in range(TEXT_POOL_SIZE)
+    ]
+
+
+class Generator:
+    """
+    Лениво создаёт строки таблиц в формате БД с явными первичными ключами,
+    продолжая уже существующие. Строки дочерних объектов создаются
+    столбцами сразу для всего родителя.
+    """
+
+    def __init__(self, options):
+        self.seed = options['seed']
+        self.rng = random.Random(self.seed)
+        self.options = options
+        self.alpha = options['alpha']
+        self.first_ids = {model: get_next_id(model) for model in MODELS}
+        self.now = timezone.now()
+
+    def id_range(self, model, amount):
+        first = self.first_ids[model]
+        return range(first, first + amount)
+
+    def pub_dates(self, amount):
+        period = int(PUBLICATION_PERIOD.total_seconds())
+        adapt = connection.ops.adapt_datetimefield_value
+        return [
+            adapt(self.now - timedelta(seconds=seconds))
+            for seconds in self.rng.choices(range(period), k=amount)
+        ]
+
+    def users(self):
+        for pk in self.id_range(CustomUser, self.options['users']):
+            yield pk, f'user{pk}', f'user{pk}@yamdb.fake'
+
+    def categories(self):
+        for pk in self.id_range(Category, self.options['categories']):
+            yield pk, f'Категория {pk}', f'c{pk}'
+
+    def genres(self):
+        for pk in self.id_range(Genre, self.options['genres']):
+            yield pk, f'Жанр {pk}', f'g{pk}'
+
+    def titles(self):
+        rng = self.rng
+        names = make_texts(rng, 1, 4)
+        descriptions = make_texts(rng, 5, 30)
+        categories = self.id_range(Category, self.options['categories'])
+        cum_weights = zipf_cum_weights(len(categories), self.alpha)
+        last_year = self.now.year
+        for pk in self.id_range(Title, self.options['titles']):
+            yield (
+                pk,
+                f'{rng.choice(names)} {pk}',
+                rng.randint(FIRST_YEAR, last_year),
+                rng.choice(descriptions),
+                rng.choices(categories, cum_weights=cum_weights)[0],
+            )
+
+    def genre_titles(self):
+        """Связи произведений с жанрами, популярность жанров по Ципфу"""
+        rng = self.rng
+        genres = self.id_range(Genre, self.options['genres'])
+        cum_weights = zipf_cum_weights(len(genres), self.alpha)
+        for title_id in self.id_range(Title, self.options['titles']):
+            fanout = min(
+                rng.choices(GENRE_FANOUT, GENRE_FANOUT_WEIGHTS)[0],
+                len(genres)
+            )
+            title_genres = []
+            while len(title_genres) < fanout:
+                for genre_id in rng.choices(
+                    genres, cum_weights=cum_weights, k=fanout
+                ):
+                    if genre_id not in title_genres:
+                        title_genres.append(genre_id)
+            for genre_id in title_genres[:fanout]:
+                yield title_id, genre_id
+
+    def reviews(self):
+        """
+        Отзывы к произведениям, число отзывов на произведение распределено
+        по закону Парето. Автор оставляет один отзыв на произведение.
+        """
+        rng = self.rng
+        texts = make_texts(rng, 3, 40)
+        users = self.id_range(CustomUser, self.options['users'])
+        titles = self.id_range(Title, self.options['titles'])
+        first_id = next_id = self.first_ids[Review]
+        amounts = power_law_counts(
+            f'{self.seed}:reviews', len(titles), self.options['reviews'],
+            self.alpha, len(users)
+        )
+        for title_id, amount in zip(titles, amounts):
+            yield from zip(
+                range(next_id, next_id + amount),
+                [title_id] * amount,
+                rng.sample(users, amount),
+                rng.choices(texts, k=amount),
+                rng.choices(SCORES, SCORE_WEIGHTS, k=amount),
+                self.pub_dates(amount),
+            )
+            next_id += amount
+        self.review_count = next_id - first_id
+
+    def comments(self):
+        """Комментарии к отзывам, число на отзыв распределено по Парето"""
+        rng = self.rng
+        texts = make_texts(rng, 2, 20)
+        users = self.id_range(CustomUser, self.options['users'])
+        reviews = self.id_range(Review, self.review_count)
+        comments = self.options['comments']
+        amounts = power_law_counts(
+            f'{self.seed}:comments', len(reviews), comments, self.alpha,
+            comments
+        )
+        next_id = self.first_ids[Comment]
+        for review_id, amount in zip(reviews, amounts):
+            yield from zip(
+                range(next_id, next_id + amount),
+                [review_id] * amount,
+                rng.choices(users, k=amount),
+                rng.choices(texts, k=amount),
+                self.pub_dates(amount),
+            )
+            next_id += amount
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт синтетический набор данных для нагрузочных замеров: '
+        'число отзывов на произведение и комментариев на отзыв '
+        'распределено по степенному закону'
+    )
+
+    def add_arguments(self, parser):
+        for name, default in (
+            ('users', 10000),
+            ('categories', 20),
+            ('genres', 50),
+            ('titles', 10000),
+            ('reviews', 100000),
+            ('comments', 200000),
+        ):
+            parser.add_argument(
+                f'--{name}',
+                type=int,
+                default=default,
+                help=f'Количество объектов, по умолчанию {default}'
+            )
+        parser.add_argument(
+            '--alpha',
+            type=float,
+            default=1.5,
+            help='Показатель степенного закона (больше 1), чем он меньше, '
+                 'тем сильнее перекос к популярным объектам'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Зерно генератора случайных чисел'
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Предварительно очищает таблицы, как load_csv --clear'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Количество строк в одном executemany'
+        )
+
+    def insert(self, name, model, fields, rows, batch_size):
+        started = perf_counter()
+        amount = insert_rows(model, fields, rows, batch_size)
+        elapsed = perf_counter() - started
+        rate = amount / elapsed if elapsed else amount
+        self.stdout.write(
+            f'{name}: {amount} строк за {elapsed:.2f} с ({rate:.0f} строк/с)'
+        )
+
+    def generate(self, generator, batch_size):
+        self.insert(
+            'users', CustomUser, ('id', 'username', 'email'),
+            generator.users(), batch_size
+        )
+        self.insert(
+            'categories', Category, ('id', 'name', 'slug'),
+            generator.categories(), batch_size
+        )
+        self.insert(
+            'genres', Genre, ('id', 'name', 'slug'),
+            generator.genres(), batch_size
+        )
+        self.insert(
+            'titles', Title, ('id', 'name', 'year', 'description', 'category'),
+            generator.titles(), batch_size
+        )
+        self.insert(
+            'genre_title', Title.genre.through, ('title', 'genre'),
+            generator.genre_titles(), batch_size
+        )
+        self.insert(
+            'reviews', Review,
+            ('id', 'title', 'author', 'text', 'score', 'pub_date'),
+            generator.reviews(), batch_size
+        )
+        self.insert(
+            'comments', Comment,
+            ('id', 'review', 'author', 'text', 'pub_date'),
+            generator.comments(), batch_size
+        )
+
+    def handle(self, *args, **options):
+        if options['alpha'] <= 1:
+            raise CommandError('Показатель --alpha должен быть больше 1.')
+        if options['categories'] < 1 or options['genres'] < 1:
+            raise CommandError('Нужна хотя бы одна категория и один жанр.')
+        if options['clear']:
+            del_data()
+        try:
+            self.generate(Generator(options), options['batch_size'])
+            started = perf_counter()
+            recalculate_ratings()
+            self.stdout.write(
+                f'Рейтинги пересчитаны за {perf_counter() - started:.2f} с')
+            self.reset_sequences()
+        finally:
+            invalidate_all()
+        self.stdout.write(self.style.SUCCESS('Данные созданы.'))
+
+    def reset_sequences(self):
+        """Первичные ключи заданы явно, счётчики БД нужно подвинуть."""
+        statements = connection.ops.sequence_reset_sql(no_style(), MODELS)
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
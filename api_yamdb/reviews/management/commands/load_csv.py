@@ -1,12 +1,25 @@
 import csv
 import os
+from collections import defaultdict
+from itertools import islice
+from time import perf_counter
 
 import django.db.utils
+from django.apps import apps
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.management.base import BaseCommand
+from django.core.management.color import no_style
+from django.db import connection, transaction
 
+from api.cache import invalidate_all
 from reviews.models import Comment, Review, Category, Genre, Title
+from reviews.ratings import recalculate_ratings
 from users.models import CustomUser
+from users.tokens import TOKEN_CLAIMS, revoke_tokens
+
+DATA_DIR = os.path.join(settings.BASE_DIR, 'static', 'data')
+BATCH_SIZE = 5000
 
 DATA = {
     CustomUser: 'users.csv',
@@ -16,14 +29,14 @@ DATA = {
     Review: 'review.csv',
     Comment: 'comments.csv'
 }
+GENRE_TITLE_FILE = 'genre_title.csv'
 
 
-def read_csv(name_file):
-    """Считывает данные из csv и возвращает список строк таблицы"""
-    path = os.path.join('static/data', name_file)
-    with open(path, encoding='utf-8') as csv_file:
-        reader = csv.DictReader(csv_file, delimiter=',')
-        return list(reader)
+def read_csv(name_file, data_dir=DATA_DIR):
+    """Лениво считывает строки таблицы из csv, не держа файл в памяти"""
+    path = os.path.join(data_dir, name_file)
+    with open(path, encoding='utf-8', newline='') as csv_file:
+        yield from csv.DictReader(csv_file, delimiter=',')
 
 
 def get_list_fields_model(model):
@@ -40,7 +53,7 @@ def get_list_fields_model(model):
 
 def changes_fields(fields_model, table):
     """
-    Изменяет название полей прочитанной таблицы
+    Изменяет название полей прочитанных строк
     для корректной записи в БД
     """
     for row in table:
@@ -51,35 +64,248 @@ def changes_fields(fields_model, table):
                     != fields_model[name_field.replace("_id", "")]
             ):
                 row[fields_model[name_field]] = row.pop(name_field)
+        yield row
+
+
+def batched(iterable, size):
+    """Разбивает поток объектов на списки длиной не больше size"""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
 
+def insert_batches(model, objects, batch_size=BATCH_SIZE):
+    """
+    Записывает поток объектов пачками в одной транзакции.
+    Возвращает количество записанных строк.
+    """
+    count = 0
+    with transaction.atomic():
+        for batch in batched(objects, batch_size):
+            model.objects.bulk_create(batch, batch_size=batch_size)
+            count += len(batch)
+    return count
 
-def load_data(model, name_file):
+
+def insert_rows(model, fields, rows, batch_size=BATCH_SIZE):
+    """
+    Записывает поток кортежей значений полей fields подготовленным INSERT
+    через executemany, не создавая объекты модели. Значения должны быть
+    в формате БД, остальные поля получают значения по умолчанию.
+    Возвращает количество записанных строк.
+    """
+    quote = connection.ops.quote_name
+    defaults = {
+        field: field.get_db_prep_save(field.get_default(), connection)
+        for field in model._meta.concrete_fields
+        if field.name not in fields and field.attname not in fields
+        and not field.primary_key
+    }
+    columns = [model._meta.get_field(name).column for name in fields]
+    columns += [field.column for field in defaults]
+    default_values = tuple(defaults.values())
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        quote(model._meta.db_table),
+        ', '.join(map(quote, columns)),
+        ', '.join(['%s'] * len(columns))
+    )
+    count = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        for batch in batched(rows, batch_size):
+            cursor.executemany(
+                sql, [row + default_values for row in batch]
+            )
+            count += len(batch)
+    return count
+
+
+def read_rows(model, name_file, data_dir=DATA_DIR):
+    """Лениво считывает строки csv с названиями полей модели"""
+    return changes_fields(
+        get_list_fields_model(model), read_csv(name_file, data_dir)
+    )
+
+
+def read_objects(model, name_file, data_dir=DATA_DIR):
+    """Лениво превращает строки csv в объекты модели"""
+    return (model(**row) for row in read_rows(model, name_file, data_dir))
+
+
+def read_genre_title(data_dir=DATA_DIR):
+    """Лениво превращает строки genre_title.csv в связи Title.genre"""
+    through = Title.genre.through
+    return (
+        through(title_id=row['title_id'], genre_id=row['genre_id'])
+        for row in read_csv(GENRE_TITLE_FILE, data_dir)
+    )
+
+
+def load_data(model, name_file, data_dir=DATA_DIR, batch_size=BATCH_SIZE):
     """
     Загрузка данных по имени модели.
     Не загружает данные во вспомогательную таблицу
     со связью многие ко многим
     """
-    table = read_csv(name_file)
-    changes_fields(get_list_fields_model(model), table)
-    model.objects.bulk_create(model(**row) for row in table)
+    return insert_batches(
+        model, read_objects(model, name_file, data_dir), batch_size
+    )
 
 
-def load_genre_title():
+def load_genre_title(data_dir=DATA_DIR, batch_size=BATCH_SIZE):
     """
     Загружает данные во вспомогательную таблицу
     для моделей со связью многие ко многим
     """
-    data_list = read_csv('genre_title.csv')
-    [
-        Title.objects.get(id=row['title_id']).genre.add(row['genre_id'])
-        for row in data_list
-    ]
+    return insert_batches(
+        Title.genre.through, read_genre_title(data_dir), batch_size
+    )
 
 
-def del_data():
-    """Удаляет все таблицы из базы данных"""
-    for model in DATA:
-        model.objects.all().delete()
+def clean_row(fields, row):
+    """
+    Приводит строковые значения из csv к типам полей модели.
+    Поля с auto_now/auto_now_add заполняются при записи, их пропускаем.
+    """
+    cleaned = {}
+    for name, value in row.items():
+        field = fields[name]
+        if getattr(field, 'auto_now', False) or getattr(
+            field, 'auto_now_add', False
+        ):
+            continue
+        if value == '' and field.null:
+            value = None
+        cleaned[name] = field.to_python(value)
+    return cleaned
+
+
+def upsert_batch(model, rows, batch_size):
+    """
+    Создаёт новые и обновляет изменившиеся объекты пачки по первичному ключу.
+    Возвращает созданные объекты и пары (старые значения, объект)
+    для изменённых.
+    """
+    fields = {field.attname: field for field in model._meta.concrete_fields}
+    rows = [clean_row(fields, row) for row in rows]
+    existing = model.objects.in_bulk([row[model._meta.pk.attname]
+                                      for row in rows])
+    created, changed, changed_fields = [], [], set()
+    for row in rows:
+        obj = existing.get(row[model._meta.pk.attname])
+        if obj is None:
+            created.append(model(**row))
+            continue
+        old_values = {}
+        for name, value in row.items():
+            if getattr(obj, name) != value:
+                old_values[name] = getattr(obj, name)
+                setattr(obj, name, value)
+        if old_values:
+            changed.append((old_values, obj))
+            changed_fields.update(old_values)
+    model.objects.bulk_create(created, batch_size=batch_size)
+    if changed:
+        model.objects.bulk_update(
+            [obj for _, obj in changed], changed_fields, batch_size=batch_size
+        )
+    return created, changed
+
+
+def get_affected_title_ids(created, changed):
+    """Произведения, рейтинг которых меняют созданные и изменённые отзывы"""
+    title_ids = {review.title_id for review in created}
+    for old_values, review in changed:
+        if 'score' in old_values or 'title_id' in old_values:
+            title_ids.add(review.title_id)
+            title_ids.add(old_values.get('title_id', review.title_id))
+    return title_ids
+
+
+def revoke_changed_tokens(changed):
+    """bulk_update не отправляет сигналы, токены отзываются здесь."""
+    for old_values, user in changed:
+        if old_values.keys() & set(TOKEN_CLAIMS):
+            revoke_tokens(user.pk)
+
+
+def upsert_data(model, name_file, data_dir=DATA_DIR, batch_size=BATCH_SIZE):
+    """
+    Применяет дельту из csv: создаёт новые строки и обновляет изменённые,
+    не трогая остальные. Возвращает количество созданных и изменённых строк
+    и произведения, чей рейтинг нужно пересчитать.
+    """
+    created_count = changed_count = 0
+    title_ids = set()
+    with transaction.atomic():
+        rows = read_rows(model, name_file, data_dir)
+        for batch in batched(rows, batch_size):
+            created, changed = upsert_batch(model, batch, batch_size)
+            created_count += len(created)
+            changed_count += len(changed)
+            if model is Review:
+                title_ids |= get_affected_title_ids(created, changed)
+            elif model is CustomUser:
+                revoke_changed_tokens(changed)
+    return created_count, changed_count, title_ids
+
+
+def upsert_genre_title(data_dir=DATA_DIR, batch_size=BATCH_SIZE):
+    """Добавляет недостающие связи произведений с жанрами"""
+    count = 0
+    with transaction.atomic():
+        for batch in batched(read_genre_title(data_dir), batch_size):
+            Title.genre.through.objects.bulk_create(
+                batch, batch_size=batch_size, ignore_conflicts=True
+            )
+            count += len(batch)
+    return count
+
+
+def get_tables_to_clear(models):
+    """
+    Возвращает таблицы моделей и всех таблиц, ссылающихся на них
+    (в том числе таблиц связей многие ко многим), в порядке очистки:
+    зависимые таблицы идут раньше тех, на которые ссылаются.
+    """
+    referencing = defaultdict(set)
+    for model in apps.get_models(include_auto_created=True):
+        if not model._meta.managed or model._meta.proxy:
+            continue
+        for field in model._meta.concrete_fields:
+            if field.many_to_one or field.one_to_one:
+                referencing[field.related_model._meta.concrete_model].add(
+                    model
+                )
+    ordered = []
+
+    def visit(model, path):
+        if model in ordered or model in path:
+            return
+        for child in sorted(referencing[model], key=str):
+            visit(child, path | {model})
+        ordered.append(model)
+
+    for model in models:
+        visit(model, frozenset())
+    return [model._meta.db_table for model in ordered]
+
+
+def del_data(vacuum=False):
+    """
+    Очищает таблицы из DATA и зависящие от них таблицы одним DELETE
+    на таблицу, не загружая строки в память и не запуская каскадное
+    удаление Django, и сбрасывает счётчики первичных ключей.
+    """
+    tables = get_tables_to_clear(DATA)
+    # Пользователи удаляются без сигналов, а их id достанутся новым.
+    revoke_tokens()
+    connection.ops.execute_sql_flush(
+        connection.ops.sql_flush(no_style(), tables, reset_sequences=True)
+    )
+    if vacuum and connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('VACUUM')
+    return tables
 
 
 class Command(BaseCommand):
@@ -96,17 +322,81 @@ class Command(BaseCommand):
             action='store_true',
             help='Удаляет все данные из базы данных'
         )
+        parser.add_argument(
+            '--vacuum',
+            action='store_true',
+            help='После --clear сжимает файл базы данных SQLite (VACUUM)'
+        )
+        parser.add_argument(
+            '--upsert',
+            action='store_true',
+            help='Добавляет новые и обновляет изменённые строки из csv'
+        )
+        parser.add_argument(
+            '--path',
+            default=DATA_DIR,
+            help='Папка с csv, для --upsert файлы таблиц необязательны'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Количество строк в одном INSERT'
+        )
+
+    def report(self, name_file, count, started):
+        elapsed = perf_counter() - started
+        rate = count / elapsed if elapsed else count
+        self.stdout.write(
+            f'{name_file}: {count} строк за {elapsed:.2f} с '
+            f'({rate:.0f} строк/с)'
+        )
+
+    def load_all(self, data_dir, batch_size):
+        for model, name_file in DATA.items():
+            started = perf_counter()
+            count = load_data(model, name_file, data_dir, batch_size)
+            self.report(name_file, count, started)
+        started = perf_counter()
+        count = load_genre_title(data_dir, batch_size)
+        self.report(GENRE_TITLE_FILE, count, started)
+        recalculate_ratings()
+
+    def upsert_all(self, data_dir, batch_size):
+        title_ids = set()
+        for model, name_file in DATA.items():
+            if not os.path.exists(os.path.join(data_dir, name_file)):
+                continue
+            started = perf_counter()
+            created, changed, affected = upsert_data(
+                model, name_file, data_dir, batch_size
+            )
+            title_ids |= affected
+            self.report(name_file, created + changed, started)
+            self.stdout.write(f'  новых: {created}, изменённых: {changed}')
+        if os.path.exists(os.path.join(data_dir, GENRE_TITLE_FILE)):
+            started = perf_counter()
+            count = upsert_genre_title(data_dir, batch_size)
+            self.report(GENRE_TITLE_FILE, count, started)
+        recalculate_ratings(title_ids)
+        self.stdout.write(f'Пересчитан рейтинг {len(title_ids)} произведений.')
 
     def handle(self, *args, **options):
         try:
             if options['all']:
-                for model, name_file in DATA.items():
-                    load_data(model, name_file)
-                load_genre_title()
+                self.load_all(options['path'], options['batch_size'])
                 self.stdout.write(
                     self.style.SUCCESS('Таблицы загружены в базу данных.'))
+            elif options['upsert']:
+                self.upsert_all(options['path'], options['batch_size'])
+                self.stdout.write(
+                    self.style.SUCCESS('Изменения применены к базе данных.'))
             elif options['clear']:
-                del_data()
+                started = perf_counter()
+                tables = del_data(options['vacuum'])
+                self.stdout.write(
+                    f'Очищено таблиц: {len(tables)} за '
+                    f'{perf_counter() - started:.2f} с')
                 self.stdout.write(
                     self.style.SUCCESS('База данных успешно очищена.'))
             else:
@@ -123,3 +413,5 @@ class Command(BaseCommand):
         except Exception as e:
             self.stdout.write(self.style.ERROR('Ошибка загрузки данных:'
                                                ' "%s"' % e))
+        finally:
+            invalidate_all()
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.cache import invalidate_all
+from reviews.ratings import get_inconsistent_titles, recalculate_ratings
+
+
+class Command(BaseCommand):
+    help = 'Проверяет и пересчитывает рейтинги произведений по отзывам'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверяет счётчики рейтинга, ничего не изменяя'
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            inconsistent = list(get_inconsistent_titles())
+            for title in inconsistent:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f'{title.pk} "{title}": сохранено '
+                        f'{title.rating_sum}/{title.rating_count} '
+                        f'(рейтинг {title.rating}), по отзывам '
+                        f'{title.actual_sum}/{title.actual_count} '
+                        f'(рейтинг {title.actual_rating})'
+                    )
+                )
+            if inconsistent:
+                raise CommandError(
+                    f'Рейтинг не совпадает с отзывами у {len(inconsistent)} '
+                    'произведений. Запустите команду без --check.'
+                )
+            self.stdout.write(
+                self.style.SUCCESS('Рейтинги совпадают с отзывами.'))
+            return
+        updated = recalculate_ratings()
+        invalidate_all()
+        self.stdout.write(
+            self.style.SUCCESS(f'Рейтинги пересчитаны: {updated} шт.'))
@@ -0,0 +1,66 @@
+from django.db import migrations
+
+NORMALIZE = "replace(replace(coalesce({}, ''), 'ё', 'е'), 'Ё', 'Е')"
+INDEXED_VALUES = '{0}.id, {1}, {2}'.format(
+    '{0}',
+    NORMALIZE.format('{0}.name'),
+    NORMALIZE.format('{0}.description'),
+)
+
+CREATE_SQL = (
+    "CREATE VIRTUAL TABLE reviews_title_fts USING fts5("
+    "name, description, content='', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "INSERT INTO reviews_title_fts(rowid, name, description) "
+    "SELECT {} FROM reviews_title".format(
+        INDEXED_VALUES.format('reviews_title')
+    ),
+    "CREATE TRIGGER reviews_title_fts_insert AFTER INSERT ON reviews_title "
+    "BEGIN "
+    "INSERT INTO reviews_title_fts(rowid, name, description) "
+    "VALUES ({}); END".format(INDEXED_VALUES.format('new')),
+    "CREATE TRIGGER reviews_title_fts_delete AFTER DELETE ON reviews_title "
+    "BEGIN "
+    "INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name, "
+    "description) VALUES ('delete', {}); END".format(
+        INDEXED_VALUES.format('old')
+    ),
+    "CREATE TRIGGER reviews_title_fts_update AFTER UPDATE OF name, "
+    "description ON reviews_title "
+    "BEGIN "
+    "INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name, "
+    "description) VALUES ('delete', {}); "
+    "INSERT INTO reviews_title_fts(rowid, name, description) "
+    "VALUES ({}); END".format(
+        INDEXED_VALUES.format('old'), INDEXED_VALUES.format('new')
+    ),
+)
+
+DROP_SQL = (
+    'DROP TRIGGER IF EXISTS reviews_title_fts_update',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_delete',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_insert',
+    'DROP TABLE IF EXISTS reviews_title_fts',
+)
+
+
+def run_on_sqlite(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_on_sqlite(CREATE_SQL), run_on_sqlite(DROP_SQL)
+        ),
+    ]
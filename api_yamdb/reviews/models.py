@@ -28,7 +28,7 @@ class ReviewCommentBase(models.Model):
 
     class Meta:
         abstract = True
-        ordering = ('pub_date',)
+        ordering = ('pub_date', 'id')
 
     def __str__(self):
         return self.text
@@ -43,14 +43,16 @@ class Review(ReviewCommentBase):
         ],
         verbose_name='Оценка'
     )
+    # Индекс по title покрывает составной индекс review_title_pub_date_idx.
     title = models.ForeignKey(
         'Title',
         on_delete=models.CASCADE,
         related_name='reviews',
-        verbose_name='Произведение'
+        verbose_name='Произведение',
+        db_index=False
     )
 
-    class Meta:
+    class Meta(ReviewCommentBase.Meta):
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
         constraints = [
@@ -59,20 +61,50 @@ class Review(ReviewCommentBase):
                 name='unique_author_title'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            )
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_rating_state()
+        return instance
+
+    def remember_rating_state(self):
+        """
+        Запоминает сохранённые в БД оценку и произведение,
+        чтобы при изменении отзыва пересчитать рейтинг на разницу.
+        """
+        self._saved_rating_state = (self.title_id, self.score)
+
+    def get_saved_rating_state(self):
+        return getattr(self, '_saved_rating_state', None)
 
 
 class Comment(ReviewCommentBase):
     """Описание модели 'Комментарий'."""
+    # Индекс по review покрывает составной индекс comment_review_pub_date_idx.
     review = models.ForeignKey(
         Review,
         on_delete=models.CASCADE,
         related_name='comments',
-        verbose_name='Отзыв'
+        verbose_name='Отзыв',
+        db_index=False
     )
 
-    class Meta:
+    class Meta(ReviewCommentBase.Meta):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            )
+        ]
 
 
 class CategoryGenreBase(models.Model):
@@ -120,6 +152,9 @@ class Title(models.Model):
     принимает дефоптное значение.
     Значение по умолчанию - 'Null'.
     description - Краткое представление произведения.
+    rating_sum, rating_count - сумма и количество оценок из отзывов,
+    обновляются при создании, изменении и удалении отзыва.
+    rating - целая часть средней оценки, 'Null' если отзывов нет.
     """
     name = models.CharField(
         verbose_name='Название',
@@ -148,11 +183,29 @@ class Title(models.Model):
         related_name='titles',
         null=True
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок',
+        default=0,
+        editable=False
+    )
+    rating = models.PositiveSmallIntegerField(
+        verbose_name='Рейтинг',
+        null=True,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ('name',)
+        indexes = [
+            models.Index(fields=('name', 'id'), name='title_name_id_idx')
+        ]
 
     def __str__(self):
         return self.name
@@ -0,0 +1,80 @@
+from django.db.models import (
+    Count, ExpressionWrapper, F, IntegerField, OuterRef, Q, Subquery, Sum
+)
+from django.db.models.functions import Coalesce, NullIf
+
+from .models import Review, Title
+
+
+def change_title_rating(title_id, score_delta, count_delta):
+    """
+    Сдвигает счётчики рейтинга произведения одним UPDATE.
+    Рейтинг пересчитывается в БД из новых значений счётчиков,
+    поэтому параллельные отзывы не затирают друг друга.
+    """
+    new_sum = F('rating_sum') + score_delta
+    new_count = F('rating_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=new_sum,
+        rating_count=new_count,
+        rating=new_sum / NullIf(new_count, 0)
+    )
+
+
+def get_actual_rating_expressions():
+    """
+    Возвращает выражения суммы, количества оценок и рейтинга,
+    посчитанные по таблице отзывов.
+    """
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    rating_sum = Coalesce(
+        Subquery(reviews.annotate(value=Sum('score')).values('value')), 0
+    )
+    rating_count = Coalesce(
+        Subquery(reviews.annotate(value=Count('id')).values('value')), 0
+    )
+    rating = Subquery(
+        reviews.annotate(
+            value=ExpressionWrapper(
+                Sum('score') / Count('id'),
+                output_field=IntegerField()
+            )
+        ).values('value')
+    )
+    return rating_sum, rating_count, rating
+
+
+def recalculate_ratings(title_ids=None):
+    """
+    Пересчитывает рейтинг произведений по отзывам.
+    Без title_ids пересчитываются все произведения.
+    Возвращает количество обновлённых произведений.
+    """
+    titles = Title.objects.all()
+    if title_ids is not None:
+        titles = titles.filter(pk__in=title_ids)
+    rating_sum, rating_count, rating = get_actual_rating_expressions()
+    return titles.update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        rating=rating
+    )
+
+
+def get_inconsistent_titles():
+    """Возвращает произведения, у которых счётчики разошлись с отзывами."""
+    rating_sum, rating_count, rating = get_actual_rating_expressions()
+    return Title.objects.annotate(
+        actual_sum=rating_sum,
+        actual_count=rating_count,
+        actual_rating=rating
+    ).filter(
+        ~Q(rating_sum=F('actual_sum'))
+        | ~Q(rating_count=F('actual_count'))
+        | Q(rating__isnull=True, actual_rating__isnull=False)
+        | Q(rating__isnull=False, actual_rating__isnull=True)
+        | Q(rating__lt=F('actual_rating'))
+        | Q(rating__gt=F('actual_rating'))
+    )
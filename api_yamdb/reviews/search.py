@@ -0,0 +1,76 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Title
+
+SEARCH_TABLE = 'reviews_title_fts'
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+MIN_STEM_LENGTH = 3
+WORD_PATTERN = re.compile(r'\w+')
+RUSSIAN_ENDINGS = sorted((
+    'иями', 'ями', 'ами', 'ого', 'его', 'ому', 'ему', 'ыми', 'ими', 'ых',
+    'их', 'ах', 'ях', 'ам', 'ям', 'ов', 'ев', 'ой', 'ей', 'ий', 'ый', 'ая',
+    'яя', 'ое', 'ее', 'ом', 'ем', 'ую', 'юю', 'а', 'я', 'ы', 'и', 'о', 'е',
+    'у', 'ю', 'ь', 'й',
+), key=len, reverse=True)
+
+
+def normalize(text):
+    """Приводит текст к виду, в котором он хранится в индексе."""
+    return text.lower().replace('ё', 'е')
+
+
+def stem(word):
+    """
+    Отсекает падежное окончание, чтобы 'войны' и 'войну' находили 'Война'.
+    Стеммера для русского в FTS5 нет, поэтому основа ищется по префиксу.
+    """
+    for ending in RUSSIAN_ENDINGS:
+        if (
+            word.endswith(ending)
+            and len(word) - len(ending) >= MIN_STEM_LENGTH
+        ):
+            return word[:-len(ending)]
+    return word
+
+
+def build_match_query(text):
+    """
+    Собирает запрос FTS5 из слов поиска: каждое слово ищется по основе
+    как префикс, все слова должны встретиться.
+    Спецсимволы синтаксиса FTS5 отбрасываются.
+    """
+    words = WORD_PATTERN.findall(normalize(text))
+    return ' '.join(f'"{stem(word)}"*' for word in words) or None
+
+
+def search_titles(queryset, text):
+    """
+    Фильтрует произведения по полнотекстовому индексу названия и описания,
+    сортируя по релевантности (совпадения в названии весят больше).
+    """
+    query = build_match_query(text)
+    if query is None:
+        return queryset.none()
+    if connection.vendor != 'sqlite':
+        return queryset.filter(
+            Q(name__icontains=text) | Q(description__icontains=text)
+        )
+    title_table = Title._meta.db_table
+    matched_ids = RawSQL(
+        f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s',
+        (query,)
+    )
+    rank = RawSQL(
+        f'SELECT bm25({SEARCH_TABLE}, {NAME_WEIGHT}, {DESCRIPTION_WEIGHT}) '
+        f'FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s '
+        f'AND rowid = {title_table}.id',
+        (query,)
+    )
+    return queryset.filter(id__in=matched_ids).annotate(
+        search_rank=rank
+    ).order_by('search_rank', 'name', 'id')
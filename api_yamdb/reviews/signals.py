@@ -0,0 +1,37 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Review
+from .ratings import change_title_rating
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_review_save(sender, instance, created, raw=False,
+                                 **kwargs):
+    """Учитывает новую или изменённую оценку в рейтинге произведения."""
+    if raw:
+        return
+    saved_state = instance.get_saved_rating_state()
+    if created or saved_state is None:
+        change_title_rating(instance.title_id, instance.score, 1)
+    else:
+        saved_title_id, saved_score = saved_state
+        if saved_title_id == instance.title_id:
+            if saved_score != instance.score:
+                change_title_rating(
+                    instance.title_id, instance.score - saved_score, 0
+                )
+        else:
+            change_title_rating(saved_title_id, -saved_score, -1)
+            change_title_rating(instance.title_id, instance.score, 1)
+    instance.remember_rating_state()
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_review_delete(sender, instance, **kwargs):
+    """Убирает оценку удалённого отзыва из рейтинга произведения."""
+    title_id, score = (
+        instance.get_saved_rating_state()
+        or (instance.title_id, instance.score)
+    )
+    change_title_rating(title_id, -score, -1)
@@ -1,9 +1,17 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from .models import CustomUser
+from .models import CustomUser, OutgoingEmail
 
 UserAdmin.fieldsets += (
     ('Extra Fields', {'fields': ('bio', 'role', 'confirmation_code',)}),
 )
 admin.site.register(CustomUser, UserAdmin)
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipient', 'subject', 'created', 'attempts', 'next_attempt_at'
+    )
+    readonly_fields = ('created', 'last_error')
@@ -0,0 +1,21 @@
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .tokens import StatelessUser, has_user_claims, is_revoked
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Аутентификация по JWT без запроса пользователя из БД.
+    Токены без утверждений о роли и отозванные токены
+    проверяются по БД, как в JWTAuthentication.
+    """
+
+    def get_user(self, validated_token):
+        if (
+            settings.STATELESS_JWT['ENABLED']
+            and has_user_claims(validated_token)
+            and not is_revoked(validated_token)
+        ):
+            return StatelessUser(validated_token)
+        return super().get_user(validated_token)
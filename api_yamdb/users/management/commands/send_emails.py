@@ -0,0 +1,46 @@
+from time import perf_counter, sleep
+
+from django.core.management.base import BaseCommand
+
+from users.outbox import deliver, get_pending_emails
+
+BATCH_SIZE = 100
+INTERVAL = 5
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди исходящих писем'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Отправляет письма, время которых наступило, и завершается'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Количество писем, отправляемых через одно соединение'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=INTERVAL,
+            help='Пауза в секундах, если очередь пуста'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            emails = get_pending_emails(options['batch_size'])
+            if emails:
+                started = perf_counter()
+                sent, failed = deliver(emails)
+                self.stdout.write(
+                    f'Отправлено писем: {sent}, с ошибкой: {failed} за '
+                    f'{perf_counter() - started:.2f} с'
+                )
+                continue
+            if options['once']:
+                break
+            sleep(options['interval'])
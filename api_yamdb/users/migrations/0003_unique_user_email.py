@@ -0,0 +1,48 @@
+# Generated by Django 3.2 on 2026-10-18 07:08
+
+from collections import defaultdict
+
+from django.db import IntegrityError, migrations, models
+from django.db.models import Count
+
+
+def check_duplicate_emails(apps, schema_editor):
+    """
+    Ограничение не создастся, если непустой email повторяется.
+    Такие адреса нужно исправить вручную до миграции.
+    """
+    CustomUser = apps.get_model('users', 'CustomUser')
+    emails = CustomUser.objects.exclude(email='').order_by().values(
+        'email'
+    ).annotate(total=Count('id')).filter(total__gt=1).values_list('email', flat=True)
+    users = CustomUser.objects.filter(email__in=list(emails)).order_by(
+        'email', 'id'
+    ).values_list('email', 'id')
+    if not users:
+        return
+    ids = defaultdict(list)
+    for email, pk in users:
+        ids[email].append(str(pk))
+    lines = '\n'.join(
+        f'  {email}: id {", ".join(pks)}' for email, pks in ids.items()
+    )
+    raise IntegrityError(
+        'Email должен быть уникальным, но у нескольких пользователей '
+        f'он совпадает:\n{lines}\nИзмените или очистите повторяющиеся '
+        'адреса и повторите миграцию.'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_outgoingemail'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='customuser',
+            constraint=models.UniqueConstraint(condition=models.Q(_negated=True, email=''), fields=('email',), name='unique_user_email'),
+        ),
+    ]
@@ -20,17 +20,16 @@ class UsernameAndEmailValidatorMixin:
                 raise serializers.ValidationError(
                     'Поле "email" обязательно для заполнения.'
                 )
-        existing_user_by_username = User.objects.filter(
-            username=username
-        ).exists()
-        existing_user_by_email = User.objects.filter(email=email).exists()
-        if existing_user_by_username and existing_user_by_email:
+        username_taken, email_taken, same_user = User.find_collisions(
+            username, email
+        )
+        if same_user:
             return attrs
-        if existing_user_by_username:
+        if username_taken:
             raise serializers.ValidationError(
                 'Этот username уже используется.'
             )
-        if existing_user_by_email:
+        if email_taken:
             raise serializers.ValidationError(
                 'Этот email уже используется.'
             )
@@ -1,6 +1,9 @@
 from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
+
+TRACKED_FIELDS = ('username', 'role', 'is_superuser', 'is_active')
 
 
 class CustomUser(AbstractUser):
@@ -24,6 +27,32 @@ class CustomUser(AbstractUser):
         verbose_name='Код подтверждения'
     )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_state()
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.remember_state()
+
+    def remember_state(self):
+        """Запоминает поля, изменение которых обрабатывают сигналы."""
+        self._saved_state = {
+            name: self.__dict__.get(name) for name in TRACKED_FIELDS
+        }
+
+    def field_changed(self, name):
+        saved_state = getattr(self, '_saved_state', {})
+        return saved_state.get(name) != getattr(self, name)
+
+    def username_changed(self):
+        return self.field_changed('username')
+
+    def token_claims_changed(self):
+        return any(map(self.field_changed, TRACKED_FIELDS))
+
     @property
     def is_user(self):
         return self.role == 'user'
@@ -36,6 +65,28 @@ class CustomUser(AbstractUser):
     def is_admin(self):
         return self.role == 'admin'
 
+    @classmethod
+    def find_collisions(cls, username, email, exclude_pk=None):
+        """
+        Одним запросом проверяет, заняты ли username и email.
+        Возвращает (username занят, email занят,
+        оба принадлежат одному пользователю).
+        """
+        condition = models.Q(username=username)
+        if email:
+            condition |= models.Q(email=email)
+        users = cls.objects.filter(condition)
+        if exclude_pk is not None:
+            users = users.exclude(pk=exclude_pk)
+        found = list(users.values_list('username', 'email'))
+        usernames = {found_username for found_username, _ in found}
+        emails = {found_email for _, found_email in found}
+        return (
+            username in usernames,
+            bool(email) and email in emails,
+            (username, email) in found,
+        )
+
     def clean(self):
         super().clean()
         if self.username == 'me':
@@ -43,22 +94,51 @@ class CustomUser(AbstractUser):
                 {'username': 'Использование имени "me" в качестве username '
                  'запрещено.'}
             )
-        if CustomUser.objects.exclude(
-            id=self.id
-        ).filter(username=self.username).exists():
-            raise ValidationError(
-                {'username': 'Этот username уже используется.'}
-            )
-        if self.email:
-            if CustomUser.objects.exclude(
-                id=self.id
-            ).filter(email=self.email).exists():
-                raise ValidationError(
-                    {'email': 'Этот email уже используется.'}
-                )
+        username_taken, email_taken, _ = CustomUser.find_collisions(
+            self.username, self.email, exclude_pk=self.pk
+        )
+        errors = {}
+        if username_taken:
+            errors['username'] = 'Этот username уже используется.'
+        if email_taken:
+            errors['email'] = 'Этот email уже используется.'
+        if errors:
+            raise ValidationError(errors)
 
     class Meta:
         ordering = ('id',)
+        constraints = (
+            models.UniqueConstraint(
+                fields=('email',),
+                condition=~models.Q(email=''),
+                name='unique_user_email'
+            ),
+        )
 
     def __str__(self):
         return self.username
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку, см. команду send_emails."""
+    subject = models.CharField(max_length=255, verbose_name='Тема')
+    message = models.TextField(verbose_name='Текст')
+    from_email = models.CharField(max_length=254, verbose_name='Отправитель')
+    recipient = models.EmailField(max_length=254, verbose_name='Получатель')
+    created = models.DateTimeField(auto_now_add=True, verbose_name='Создано')
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name='Попыток отправки'
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now, db_index=True,
+        verbose_name='Следующая попытка'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+
+    class Meta:
+        ordering = ('next_attempt_at', 'id')
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
@@ -0,0 +1,87 @@
+"""
+Очередь исходящих писем.
+
+Запрос только записывает письмо в таблицу OutgoingEmail, а отправляет его
+команда send_emails пачками через одно соединение с почтовым сервером.
+Неотправленные письма повторяются с экспоненциальной задержкой.
+В режиме EMAIL_OUTBOX['EAGER'] письмо отправляется сразу после коммита
+транзакции, в которой оно создано.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+
+def enqueue_email(subject, message, from_email, recipient):
+    email = OutgoingEmail.objects.create(
+        subject=subject,
+        message=message,
+        from_email=from_email,
+        recipient=recipient
+    )
+    if settings.EMAIL_OUTBOX['EAGER']:
+        transaction.on_commit(lambda: deliver([email]))
+    return email
+
+
+def get_pending_emails(limit):
+    """Письма, время отправки которых наступило."""
+    return list(OutgoingEmail.objects.filter(
+        next_attempt_at__lte=timezone.now(),
+        attempts__lt=settings.EMAIL_OUTBOX['MAX_ATTEMPTS']
+    )[:limit])
+
+
+def get_backoff(attempts):
+    delay = settings.EMAIL_OUTBOX['BACKOFF_SECONDS'] * 2 ** (attempts - 1)
+    return timedelta(
+        seconds=min(delay, settings.EMAIL_OUTBOX['MAX_BACKOFF_SECONDS'])
+    )
+
+
+def mark_failed(email, error):
+    email.attempts += 1
+    email.next_attempt_at = timezone.now() + get_backoff(email.attempts)
+    email.last_error = f'{type(error).__name__}: {error}'
+
+
+def deliver(emails):
+    """
+    Отправляет письма через одно соединение. Отправленные письма удаляются
+    из очереди, для остальных назначается следующая попытка.
+    Возвращает количество отправленных и неотправленных писем.
+    """
+    sent, failed = [], []
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as error:
+        for email in emails:
+            mark_failed(email, error)
+        failed = list(emails)
+    else:
+        try:
+            for email in emails:
+                message = EmailMessage(
+                    email.subject, email.message, email.from_email,
+                    [email.recipient], connection=connection
+                )
+                try:
+                    message.send()
+                except Exception as error:
+                    mark_failed(email, error)
+                    failed.append(email)
+                else:
+                    sent.append(email.pk)
+        finally:
+            connection.close()
+    OutgoingEmail.objects.filter(pk__in=sent).delete()
+    OutgoingEmail.objects.bulk_update(
+        failed, ('attempts', 'next_attempt_at', 'last_error')
+    )
+    return len(sent), len(failed)
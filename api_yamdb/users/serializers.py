@@ -1,6 +1,7 @@
 from django.core.validators import RegexValidator, MaxLengthValidator
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 from rest_framework.exceptions import NotFound
 
@@ -37,15 +38,22 @@ class UserSignupSerializer(
             'username': {'required': True},
         }
 
+    @transaction.atomic
     def create(self, validated_data):
         email = validated_data['email']
         username = validated_data['username']
-        user, created = User.objects.get_or_create(
-            username=username, email=email
-        )
+        try:
+            user, created = User.objects.get_or_create(
+                username=username, email=email
+            )
+        except IntegrityError:
+            # Параллельная регистрация заняла username или email.
+            raise serializers.ValidationError(
+                'Этот username или email уже используется.'
+            )
         confirmation_code = default_token_generator.make_token(user)
         user.confirmation_code = confirmation_code
-        user.save()
+        user.save(update_fields=('confirmation_code',))
         send_confirmation_email(email, confirmation_code)
         return user
 
@@ -70,6 +78,7 @@ class CustomTokenObtainSerializer(serializers.Serializer):
         if user.confirmation_code != confirmation_code:
             raise serializers.ValidationError(
                 {'confirmation_code': 'Недействительный код подтверждения.'})
+        attrs['user'] = user
         return attrs
 
 
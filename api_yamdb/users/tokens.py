@@ -0,0 +1,79 @@
+"""
+Токены доступа со сведениями о пользователе, нужными для проверки прав.
+
+Пользователь берётся из утверждений токена без запроса к БД. После смены
+роли, имени или удаления пользователя в кэш записывается отметка отзыва,
+и токены, выпущенные до неё, снова проверяются по БД. Отметка живёт
+не дольше токена доступа. Отметки хранятся в отдельном кэше
+settings.STATELESS_JWT['CACHE_ALIAS'], из которого они не вытесняются.
+"""
+from time import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+TOKEN_CLAIMS = ('username', 'role', 'is_superuser')
+REVOKED_KEY = 'auth:revoked:{}'
+ALL_USERS = 'all'
+
+
+class UserAccessToken(AccessToken):
+    """Токен доступа с ролью пользователя."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in TOKEN_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+class StatelessUser(TokenUser):
+    """Пользователь, восстановленный из утверждений токена."""
+
+    @cached_property
+    def role(self):
+        return self.token['role']
+
+    @property
+    def is_user(self):
+        return self.role == 'user'
+
+    @property
+    def is_moderator(self):
+        return self.role == 'moderator'
+
+    @property
+    def is_admin(self):
+        return self.role == 'admin'
+
+
+def has_user_claims(token):
+    return all(claim in token for claim in TOKEN_CLAIMS)
+
+
+def get_cache():
+    return caches[settings.STATELESS_JWT['CACHE_ALIAS']]
+
+
+def revoke_tokens(user_id=ALL_USERS):
+    """
+    Отзывает утверждения всех выпущенных пользователю токенов,
+    без user_id — токенов всех пользователей.
+    """
+    lifetime = api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+    get_cache().set(
+        REVOKED_KEY.format(user_id), int(time()), timeout=int(lifetime)
+    )
+
+
+def is_revoked(token):
+    revoked = get_cache().get_many([
+        REVOKED_KEY.format(ALL_USERS),
+        REVOKED_KEY.format(token[api_settings.USER_ID_CLAIM]),
+    ])
+    return bool(revoked) and token.get('iat', 0) <= max(revoked.values())
@@ -1,8 +1,8 @@
 from django.contrib.auth import get_user_model
+from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, mixins, status, filters
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.views import TokenObtainPairView
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.response import Response
 from rest_framework.exceptions import MethodNotAllowed
 
@@ -12,22 +12,24 @@ from .serializers import (
     UserSerializer,
     UserMePatchSerializer
 )
+from .tokens import UserAccessToken
+from api.mixins import LockRetryMixin
 from api.permissions import IsAdmin, IsSuperuser
 
 User = get_user_model()
 
 
-class UserSignupViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
+class UserSignupViewSet(LockRetryMixin, mixins.CreateModelMixin,
+                        viewsets.GenericViewSet):
     """Класс представления создания пользователя."""
     queryset = User.objects.all()
     serializer_class = UserSignupSerializer
     permission_classes = (AllowAny,)
 
     def create(self, request, *args, **kwargs):
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        response = super().create(request, *args, **kwargs)
+        response.status_code = status.HTTP_200_OK
+        return response
 
 
 class CustomTokenObtainPairView(TokenObtainPairView):
@@ -37,10 +39,9 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        data = serializer.validated_data
-        user = User.objects.get(username=data['username'])
-        refresh = RefreshToken.for_user(user)
-        access_token = refresh.access_token
+        access_token = UserAccessToken.for_user(
+            serializer.validated_data['user']
+        )
         return Response(
             {'token': str(access_token)},
             status=status.HTTP_200_OK
@@ -48,6 +49,7 @@ class CustomTokenObtainPairView(TokenObtainPairView):
 
 
 class UserListCreateAPIView(
+    LockRetryMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     viewsets.GenericViewSet
@@ -58,9 +60,11 @@ class UserListCreateAPIView(
     permission_classes = (IsAdmin | IsSuperuser, )
     filter_backends = (filters.SearchFilter, )
     search_fields = ('username', )
+    keyset_ordering = ('id', )
 
 
 class UserRetrieveUpdateDestroyAPIView(
+    LockRetryMixin,
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
     mixins.DestroyModelMixin,
@@ -76,6 +80,7 @@ class UserRetrieveUpdateDestroyAPIView(
 
 
 class UserAccountViewSet(
+    LockRetryMixin,
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
     viewsets.GenericViewSet
@@ -92,7 +97,9 @@ class UserAccountViewSet(
 
     def get_object(self):
         user = self.request.user
-        return user
+        if isinstance(user, User):
+            return user
+        return get_object_or_404(User, pk=user.pk)
 
     def partial_update(self, request, *args, **kwargs):
         if 'role' in request.data:
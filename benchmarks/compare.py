@@ -0,0 +1,92 @@
+"""
+Сравнивает два файла результатов замеров.
+
+    python benchmarks/compare.py old.json new.json [--threshold 0.2]
+
+С --threshold команда завершается с ошибкой, если p95 какого-либо
+сценария вырос больше чем на эту долю или выросло среднее число
+запросов к БД.
+"""
+import argparse
+import json
+import sys
+
+METRICS = ('rps', 'p50_ms', 'p95_ms', 'p99_ms', 'queries_mean', 'errors')
+# Разница меньше этой считается шумом измерения.
+MIN_LATENCY_DELTA_MS = 1.0
+
+
+def load(path):
+    with open(path, encoding='utf-8') as file:
+        report = json.load(file)
+    return report, index_results(report['results'])
+
+
+def index_results(results):
+    return {
+        (result['case'], result['concurrency']): result
+        for result in results
+    }
+
+
+def change(old, new):
+    if old in (None, 0) or new is None:
+        return ''
+    return f' ({(new - old) / old:+.1%})'
+
+
+def find_regressions(old, new, threshold, metric='p95_ms'):
+    """
+    Сравнивает результаты, проиндексированные index_results.
+    Возвращает описания сценариев, у которых metric вырос больше
+    чем на threshold или выросло среднее число запросов к БД.
+    """
+    regressions = []
+    for key in sorted(old.keys() & new.keys()):
+        before, after = old[key].get(metric), new[key].get(metric)
+        if (
+            before is not None and after is not None
+            and after > before * (1 + threshold)
+            and after - before > MIN_LATENCY_DELTA_MS
+        ):
+            regressions.append(
+                f'{key[0]}, потоков: {key[1]}: {metric} {before} -> '
+                f'{after}{change(before, after)}'
+            )
+        before = old[key].get('queries_mean')
+        after = new[key].get('queries_mean')
+        if before is not None and after is not None and after > before:
+            regressions.append(
+                f'{key[0]}, потоков: {key[1]}: запросов к БД '
+                f'{before} -> {after}'
+            )
+    return regressions
+
+
+def main(old_path, new_path, threshold=None):
+    old_report, old = load(old_path)
+    new_report, new = load(new_path)
+    print(f'{old_report["commit"]} -> {new_report["commit"]}')
+    for key in sorted(old.keys() & new.keys()):
+        case, concurrency = key
+        print(f'{case}, потоков: {concurrency}')
+        for metric in METRICS:
+            before, after = old[key].get(metric), new[key].get(metric)
+            if before is None and after is None:
+                continue
+            print(f'  {metric}: {before} -> {after}{change(before, after)}')
+    if threshold is None:
+        return 0
+    regressions = find_regressions(old, new, threshold)
+    for regression in regressions:
+        print(f'Регрессия: {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float)
+    arguments = parser.parse_args()
+    sys.exit(main(arguments.old, arguments.new, arguments.threshold))
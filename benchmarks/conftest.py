@@ -0,0 +1,32 @@
+import pytest
+
+from benchmarks.harness import write_results
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(tmp_path_factory):
+    """
+    Замеры идут на файловой БД SQLite: в отличие от БД в памяти,
+    она ведёт себя как рабочая при обращении из нескольких потоков.
+    Соединения не переживают запрос: иначе соединение, оставленное
+    одним замером (например, потоком live_server), мешает следующему
+    сменить journal_mode. Постоянные соединения сравнивает
+    test_connections.py.
+    """
+    from django.conf import settings
+
+    path = tmp_path_factory.mktemp('benchmarks') / 'benchmark.sqlite3'
+    settings.DATABASES['default'].setdefault('TEST', {})['NAME'] = str(path)
+    for database in settings.DATABASES.values():
+        database['CONN_MAX_AGE'] = 0
+
+
+@pytest.fixture(scope='module')
+def benchmark_results(request):
+    """Собирает результаты замеров модуля и записывает их в JSON."""
+    results = []
+    yield results
+    if results:
+        name = request.module.__name__.rsplit('.', 1)[-1]
+        path = write_results(name.replace('test_', '', 1), results)
+        print(f'\nРезультаты замеров: {path}')
@@ -0,0 +1,168 @@
+"""
+Нагрузочные замеры эндпойнтов через тестовый клиент Django.
+
+Каждый поток отправляет запросы своим клиентом и своим соединением с БД.
+Результат замера: запросов в секунду, перцентили задержки и число ошибок.
+Результаты пишутся в JSON вместе с коммитом, чтобы сравнивать их
+между версиями командой `python benchmarks/compare.py old.json new.json`.
+"""
+import json
+import os
+import platform
+import subprocess
+import threading
+from datetime import datetime, timezone
+from time import perf_counter
+
+from django.db import connections
+from django.test import Client
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+PERCENTILES = (50, 95, 99)
+
+
+def get_int_list(name, default):
+    return [int(value) for value in os.getenv(name, default).split(',')]
+
+
+REQUESTS = int(os.getenv('BENCHMARK_REQUESTS', 200))
+CONCURRENCY = get_int_list('BENCHMARK_CONCURRENCY', '1,4,8')
+
+
+def percentile(values, percent):
+    """Перцентиль отсортированного списка методом ближайшего ранга."""
+    if not values:
+        return None
+    index = max(0, -(-len(values) * percent // 100) - 1)
+    return values[index]
+
+
+def summarize(latencies, errors, elapsed, concurrency, measures=()):
+    latencies = sorted(latencies)
+    result = {
+        'concurrency': concurrency,
+        'requests': len(latencies) + errors,
+        'errors': errors,
+        'elapsed_s': round(elapsed, 4),
+        'rps': round(len(latencies) / elapsed, 2) if elapsed else None,
+    }
+    for percent in PERCENTILES:
+        value = percentile(latencies, percent)
+        result[f'p{percent}_ms'] = (
+            round(value * 1000, 3) if value is not None else None
+        )
+    for name in sorted({name for measure in measures for name in measure}):
+        values = [measure[name] for measure in measures if name in measure]
+        result[f'{name}_mean'] = round(sum(values) / len(values), 3)
+        result[f'{name}_max'] = max(values)
+    return result
+
+
+def summarize_samples(samples, errors, elapsed, concurrency):
+    """Сводка по замерам (метка, задержка, показатели ответа)."""
+    return summarize(
+        [latency for _, latency, _ in samples], len(errors), elapsed,
+        concurrency, [measures for _, _, measures in samples]
+    )
+
+
+def timed_request(send, client, number, name, is_error, measure):
+    """Замер (метка, задержка, показатели ответа) или None при ошибке."""
+    started = perf_counter()
+    try:
+        response = send(client, number)
+    except Exception:
+        return None
+    latency = perf_counter() - started
+    if is_error(response):
+        return None
+    return name, latency, measure(response) if measure else {}
+
+
+def run(send, total=REQUESTS, concurrency=1, client_class=Client,
+        is_error=lambda response: response.status_code >= 400,
+        label=None, measure=None):
+    """
+    Выполняет send(client, number) для number от 0 до total
+    в concurrency потоках и возвращает сводку замера.
+    Если задан label(number), в сводку добавляются сводки по меткам
+    в ключе `labels`. measure(response) возвращает словарь числовых
+    показателей ответа, их среднее и максимум тоже попадают в сводку.
+    """
+    numbers = iter(range(total))
+    numbers_lock = threading.Lock()
+    samples, errors = [], []
+    start = threading.Barrier(concurrency + 1)
+
+    def worker():
+        client = client_class()
+        local_samples, local_errors = [], []
+        start.wait()
+        try:
+            while True:
+                with numbers_lock:
+                    number = next(numbers, None)
+                if number is None:
+                    break
+                name = label(number) if label else None
+                sample = timed_request(
+                    send, client, number, name, is_error, measure
+                )
+                if sample is None:
+                    local_errors.append(name)
+                else:
+                    local_samples.append(sample)
+        finally:
+            samples.extend(local_samples)
+            errors.extend(local_errors)
+            if threading.current_thread() is not threading.main_thread():
+                connections.close_all()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    started = perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = perf_counter() - started
+    result = summarize_samples(samples, errors, elapsed, concurrency)
+    if label:
+        names = {name for name, _, _ in samples} | set(errors)
+        result['labels'] = {
+            name: summarize_samples(
+                [sample for sample in samples if sample[0] == name],
+                [error for error in errors if error == name],
+                elapsed, concurrency
+            )
+            for name in sorted(names)
+        }
+    return result
+
+
+def get_commit():
+    try:
+        return subprocess.run(
+            ('git', 'rev-parse', '--short', 'HEAD'),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(name, results, directory=None):
+    """Записывает результаты замеров в <directory>/<name>-<commit>.json."""
+    directory = directory or os.getenv('BENCHMARK_RESULTS_DIR', RESULTS_DIR)
+    os.makedirs(directory, exist_ok=True)
+    commit = get_commit()
+    report = {
+        'name': name,
+        'commit': commit,
+        'created': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'results': results,
+    }
+    path = os.path.join(directory, f'{name}-{commit or "local"}.json')
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    return path
@@ -0,0 +1,328 @@
+"""
+Нагрузочный прогон запросов Postman-коллекции против запущенного сервера.
+
+    cd api_yamdb
+    python manage.py generate_data --clear --seed 0
+    python manage.py runserver --noreload
+    python ../benchmarks/replay.py --concurrency 1,8 --requests 2000 \\
+        --baseline ../benchmarks/results/replay-<коммит>.json
+
+Сценарии — успешные GET-запросы коллекции, запросы с ошибками
+(папки *bad_requests*, 404, несуществующие объекты) пропускаются.
+Вес сценария берётся из WEIGHTS или из JSON-файла --weights по имени
+запроса без роли. Переменные {{...}} заменяются случайными объектами
+из той же БД, что у сервера, токены выпускаются пользователям нужной роли.
+Число запросов к БД берётся из заголовка Server-Timing.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COLLECTION = os.path.join(
+    ROOT_DIR, 'postman_collection', 'Ymdb-collection.postman_collection.json'
+)
+SKIPPED_FOLDERS = re.compile(r'bad_requests|404')
+SKIPPED_NAMES = re.compile(r'non_existing|wrong')
+VARIABLE = re.compile(r'{{(\w+)}}')
+SERVER_TIMING_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+# Доля запросов сценария, остальные сценарии получают DEFAULT_WEIGHT.
+WEIGHTS = {
+    'get_titles_list': 25,
+    'get_title_detail': 15,
+    'get_title_with_rating': 5,
+    'get_reviews_list': 20,
+    'get_review_detail': 8,
+    'get_comments_list': 10,
+    'get_comment_detail': 4,
+    'get_categories_list': 3,
+    'get_genres_list': 3,
+    'get_titles_list_filtered_by_category': 2,
+    'get_titles_list_filtered_by_genre': 2,
+    'get_titles_list_filtered_by_name': 2,
+    'get_titles_list_filtered_by_year': 2,
+}
+DEFAULT_WEIGHT = 1
+SAMPLE_SIZE = 5000
+
+
+class Scenario(NamedTuple):
+    name: str
+    path: str
+    role: str
+    weight: float
+
+
+def iter_requests(items, folders=()):
+    for item in items:
+        if 'item' in item:
+            yield from iter_requests(item['item'], (*folders, item['name']))
+        else:
+            yield folders, item
+
+
+def get_role(request):
+    """Роль по переменной токена: {{adminToken}} -> admin."""
+    for option in request.get('auth', {}).get('bearer', ()):
+        match = VARIABLE.search(option.get('value', ''))
+        if option.get('key') == 'token' and match:
+            return match.group(1).replace('Token', '')
+    return None
+
+
+def load_scenarios(path=COLLECTION, weights=None):
+    """Успешные GET-запросы коллекции с весами."""
+    weights = {**WEIGHTS, **(weights or {})}
+    with open(path, encoding='utf-8') as file:
+        collection = json.load(file)
+    scenarios = []
+    for folders, item in iter_requests(collection['item']):
+        request = item['request']
+        base_name = item['name'].split('//')[0].strip()
+        if (
+            request['method'] != 'GET'
+            or any(SKIPPED_FOLDERS.search(folder) for folder in folders)
+            or SKIPPED_NAMES.search(base_name)
+        ):
+            continue
+        url = urlsplit(request['url']['raw'])
+        path = url.path + (f'?{url.query}' if url.query else '')
+        role = get_role(request)
+        weight = weights.get(base_name, DEFAULT_WEIGHT)
+        if weight > 0:
+            scenarios.append(Scenario(
+                f'{base_name} // {role or "anonymous"}', path, role, weight
+            ))
+    return scenarios
+
+
+def sample_ids(model, fields):
+    """Строки случайных объектов модели без полного просмотра таблицы."""
+    from django.db.models import Max, Min
+
+    bounds = model.objects.aggregate(low=Min('pk'), high=Max('pk'))
+    if bounds['low'] is None:
+        return []
+    population = range(bounds['low'], bounds['high'] + 1)
+    pks = random.sample(population, min(SAMPLE_SIZE, len(population)))
+    return list(model.objects.filter(pk__in=pks).values(*fields))
+
+
+class Dataset:
+    """Случайные объекты из БД для подстановки в переменные запросов."""
+
+    def __init__(self):
+        from reviews.models import Category, Comment, Genre, Review, Title
+        from users.models import CustomUser
+
+        self.titles = sample_ids(Title, ('id', 'name', 'year'))
+        self.reviews = sample_ids(Review, ('id', 'title_id'))
+        self.comments = sample_ids(
+            Comment, ('id', 'review_id', 'review__title_id')
+        )
+        self.categories = list(Category.objects.values_list('slug', flat=True))
+        self.genres = list(Genre.objects.values_list('slug', flat=True))
+        self.usernames = [
+            row['username'] for row in sample_ids(CustomUser, ('username',))
+        ]
+        if not all((self.titles, self.reviews, self.comments)):
+            raise RuntimeError(
+                'В БД нет произведений, отзывов или комментариев, '
+                'создайте их командой generate_data.'
+            )
+
+    def get_values(self, rng, names):
+        """Значения переменных одного запроса, согласованные между собой."""
+        if any(name.endswith('Comment') for name in names):
+            comment = rng.choice(self.comments)
+            title_id = comment['review__title_id']
+            review_id, comment_id = comment['review_id'], comment['id']
+        elif any(name.endswith('Review') for name in names):
+            review = rng.choice(self.reviews)
+            title_id, review_id, comment_id = (
+                review['title_id'], review['id'], None
+            )
+        else:
+            title_id = review_id = comment_id = None
+        title = rng.choice(self.titles)
+        sources = {
+            'TitleName': lambda: title['name'],
+            'TitleYear': lambda: title['year'],
+            'Title': lambda: title_id or title['id'],
+            'Review': lambda: review_id,
+            'Comment': lambda: comment_id,
+            'Category': lambda: rng.choice(self.categories),
+            'Genre': lambda: rng.choice(self.genres),
+            'Username': lambda: rng.choice(self.usernames),
+        }
+        values = {}
+        for name in names:
+            suffix = next(
+                (suffix for suffix in sources if name.endswith(suffix)), None
+            )
+            if suffix is None:
+                raise KeyError(f'Неизвестная переменная {{{{{name}}}}}')
+            values[name] = sources[suffix]()
+        return values
+
+
+def get_tokens(roles):
+    """Токены пользователей с нужными ролями, недостающие создаются."""
+    from users.models import CustomUser
+    from users.tokens import UserAccessToken
+
+    tokens = {}
+    for role in roles:
+        if role == 'superuser':
+            user = CustomUser.objects.filter(is_superuser=True).first()
+        else:
+            user = CustomUser.objects.filter(
+                role=role, is_superuser=False
+            ).first()
+        if user is None:
+            user = CustomUser.objects.create(
+                username=f'replay-{role}',
+                email=f'replay-{role}@yamdb.fake',
+                role='admin' if role == 'superuser' else role,
+                is_superuser=role == 'superuser'
+            )
+        tokens[role] = str(UserAccessToken.for_user(user))
+    return tokens
+
+
+def get_queries(response):
+    match = SERVER_TIMING_QUERIES.search(
+        response.headers.get('Server-Timing', '')
+    )
+    return {'queries': int(match.group(1))} if match else {}
+
+
+def plan_requests(scenarios, dataset, total, seed):
+    """Последовательность (сценарий, путь) с подставленными переменными."""
+    rng = random.Random(seed)
+    chosen = rng.choices(
+        scenarios, [scenario.weight for scenario in scenarios], k=total
+    )
+    plan = []
+    for scenario in chosen:
+        values = dataset.get_values(
+            rng, VARIABLE.findall(scenario.path)
+        )
+        path = VARIABLE.sub(
+            lambda match: str(values[match.group(1)]), scenario.path
+        )
+        plan.append((scenario, path))
+    return plan
+
+
+def replay(base_url, scenarios, total, concurrency, seed=0, warmup=0):
+    """Прогоняет сценарии и возвращает сводки по сценариям и общую."""
+    import requests
+
+    from benchmarks.harness import run
+
+    dataset = Dataset()
+    tokens = get_tokens({s.role for s in scenarios if s.role})
+    plan = plan_requests(scenarios, dataset, total + warmup, seed)
+    base_url = base_url.rstrip('/')
+
+    def send(session, number):
+        scenario, path = plan[number]
+        headers = {}
+        if scenario.role:
+            headers['Authorization'] = f'Bearer {tokens[scenario.role]}'
+        return session.get(f'{base_url}{path}', headers=headers, timeout=30)
+
+    if warmup:
+        run(send, warmup, concurrency, client_class=requests.Session)
+        plan = plan[warmup:]
+    result = run(
+        send, total, concurrency, client_class=requests.Session,
+        label=lambda number: plan[number][0].name, measure=get_queries
+    )
+    labels = result.pop('labels')
+    return [
+        {'case': 'all', **result},
+        *({'case': name, **summary} for name, summary in labels.items()),
+    ]
+
+
+def print_results(results):
+    print(
+        f'{"сценарий":<60} {"запросов":>8} {"ошибок":>6} {"p50":>8} '
+        f'{"p95":>8} {"p99":>8} {"к БД":>6}'
+    )
+    for result in results:
+        print(
+            f'{result["case"][:60]:<60} {result["requests"]:>8} '
+            f'{result["errors"]:>6} {result["p50_ms"] or 0:>8.1f} '
+            f'{result["p95_ms"] or 0:>8.1f} {result["p99_ms"] or 0:>8.1f} '
+            f'{result.get("queries_mean", "-"):>6}'
+        )
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(
+        description='Прогон запросов Postman-коллекции против сервера'
+    )
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--collection', default=COLLECTION)
+    parser.add_argument('--weights', help='JSON {имя запроса: вес}')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', default='1,8',
+                        help='Уровни параллельности через запятую')
+    parser.add_argument('--warmup', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', help='Файл результатов для сравнения')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Допустимый рост p95 относительно baseline')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    from benchmarks.compare import find_regressions, index_results, load
+    from benchmarks.harness import write_results
+
+    arguments = parse_arguments(argv)
+    weights = None
+    if arguments.weights:
+        with open(arguments.weights, encoding='utf-8') as file:
+            weights = json.load(file)
+    scenarios = load_scenarios(arguments.collection, weights)
+    results = []
+    for concurrency in map(int, arguments.concurrency.split(',')):
+        level_results = replay(
+            arguments.base_url, scenarios, arguments.requests, concurrency,
+            arguments.seed, arguments.warmup
+        )
+        print(f'\nПотоков: {concurrency}')
+        print_results(level_results)
+        results.extend(level_results)
+    print(f'\nРезультаты: {write_results("replay", results)}')
+    if not arguments.baseline:
+        return 0
+    _, baseline = load(arguments.baseline)
+    regressions = find_regressions(
+        baseline, index_results(results), arguments.threshold
+    )
+    for regression in regressions:
+        print(f'Регрессия: {regression}')
+    return 1 if regressions else 0
+
+
+def setup_django():
+    sys.path[:0] = [ROOT_DIR, os.path.join(ROOT_DIR, 'api_yamdb')]
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    import django
+
+    django.setup()
+
+
+if __name__ == '__main__':
+    setup_django()
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+Замеры регистрации и получения токена.
+
+    python -m pytest benchmarks/test_auth.py -s
+
+Число запросов и уровни параллельности задаются переменными
+BENCHMARK_REQUESTS и BENCHMARK_CONCURRENCY (через запятую).
+"""
+import pytest
+
+from benchmarks.harness import CONCURRENCY, REQUESTS, run
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+TOKEN_URL = '/api/v1/auth/token/'
+CONFIRMATION_CODE = 'benchmark'
+
+
+def report(benchmark_results, case, result):
+    benchmark_results.append({'case': case, **result})
+    print(
+        f'\n{case}, потоков: {result["concurrency"]}: '
+        f'{result["rps"]} запросов/с, p50 {result["p50_ms"]} мс, '
+        f'p95 {result["p95_ms"]} мс, p99 {result["p99_ms"]} мс, '
+        f'ошибок: {result["errors"]}'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize('concurrency', CONCURRENCY)
+def test_signup(concurrency, benchmark_results):
+    def send(client, number):
+        username = f'signup{concurrency}x{number}'
+        return client.post(SIGNUP_URL, data={
+            'username': username, 'email': f'{username}@yamdb.fake'
+        })
+
+    result = run(send, REQUESTS, concurrency)
+    report(benchmark_results, 'signup', result)
+    assert result['errors'] < result['requests']
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize('concurrency', CONCURRENCY)
+def test_token(concurrency, django_user_model, benchmark_results):
+    users = django_user_model.objects.bulk_create(
+        django_user_model(
+            username=f'token{number}',
+            email=f'token{number}@yamdb.fake',
+            confirmation_code=CONFIRMATION_CODE
+        )
+        for number in range(REQUESTS)
+    )
+
+    def send(client, number):
+        return client.post(TOKEN_URL, data={
+            'username': users[number].username,
+            'confirmation_code': CONFIRMATION_CODE
+        })
+
+    result = run(send, REQUESTS, concurrency)
+    report(benchmark_results, 'token', result)
+    assert result['errors'] < result['requests']
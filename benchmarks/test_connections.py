@@ -0,0 +1,107 @@
+"""
+Стоимость установки соединения с БД на запрос к списку произведений.
+
+    python -m pytest benchmarks/test_connections.py -s
+
+Запросы идут через WSGIHandler, как у рабочего сервера: в отличие
+от тестового клиента, он закрывает соединения по CONN_MAX_AGE
+в конце запроса. Сравниваются новое соединение на каждый запрос
+(CONN_MAX_AGE = 0) и постоянное соединение потока.
+"""
+from time import perf_counter
+
+import pytest
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connections
+from django.test import RequestFactory
+
+from benchmarks.harness import CONCURRENCY, REQUESTS, run, summarize
+
+TITLES = 100
+MODES = {'new': 0, 'persistent': 60}
+
+
+class WSGIResponse:
+
+    def __init__(self, status, body):
+        self.status_code = int(status.split()[0])
+        self.content = body
+
+
+class WSGIClient:
+    """Клиент, вызывающий WSGI-приложение без тестовых обвязок."""
+
+    def __init__(self):
+        self.handler = WSGIHandler()
+        self.factory = RequestFactory()
+
+    def get(self, path):
+        started = []
+        response = self.handler(
+            self.factory.get(path).environ,
+            lambda status, headers: started.append(status)
+        )
+        try:
+            body = b''.join(response)
+        finally:
+            # Отправляет request_finished, как сервер после ответа.
+            response.close()
+        return WSGIResponse(started[0], body)
+
+
+@pytest.fixture
+def titles(settings):
+    from reviews.models import Category, Genre, Title
+
+    settings.API_CACHE = {**settings.API_CACHE, 'ENABLED': False}
+    category = Category.objects.create(name='Фильм', slug='movie')
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    Title.objects.bulk_create(
+        Title(name=f'Фильм {number}', year=2000, category=category)
+        for number in range(TITLES)
+    )
+    for title in Title.objects.all():
+        title.genre.add(genre)
+
+
+@pytest.fixture
+def conn_max_age(request):
+    database = connections.databases['default']
+    previous = database['CONN_MAX_AGE']
+    database['CONN_MAX_AGE'] = MODES[request.param]
+    yield request.param
+    database['CONN_MAX_AGE'] = previous
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize('conn_max_age', tuple(MODES), indirect=True)
+@pytest.mark.parametrize('concurrency', CONCURRENCY)
+def test_titles_list(concurrency, conn_max_age, titles, benchmark_results):
+    def send(client, number):
+        return client.get(f'/api/v1/titles/?limit=10&offset={number % 90}')
+
+    result = run(send, REQUESTS, concurrency, client_class=WSGIClient)
+    benchmark_results.append({'case': f'titles_{conn_max_age}', **result})
+    print(
+        f'\n{conn_max_age}, потоков: {concurrency}: {result["rps"]} '
+        f'запросов/с, p50 {result["p50_ms"]} мс, p95 {result["p95_ms"]} мс, '
+        f'ошибок: {result["errors"]}'
+    )
+    assert result['errors'] == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_connect(benchmark_results):
+    """Открытие соединения с PRAGMA из settings.SQLITE и его закрытие."""
+    connection = connections['default']
+    latencies = []
+    started = perf_counter()
+    for _ in range(REQUESTS):
+        connection.close()
+        connect_started = perf_counter()
+        connection.ensure_connection()
+        latencies.append(perf_counter() - connect_started)
+    result = summarize(latencies, 0, perf_counter() - started, 1)
+    benchmark_results.append({'case': 'connect', **result})
+    print(f'\nустановка соединения: p50 {result["p50_ms"]} мс, '
+          f'p95 {result["p95_ms"]} мс')
@@ -0,0 +1,85 @@
+"""
+Накладные расходы цепочки middleware на запрос к API.
+
+    python -m pytest benchmarks/test_middleware.py -s
+
+Цепочка из стандартных middleware Django и цепочка, пропускающая
+сессии, CSRF, сообщения и X-Frame-Options для /api/, вызываются
+вокруг пустого представления, без разбора URL и запросов к БД.
+"""
+from time import perf_counter
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.utils.module_loading import import_string
+from django.views.decorators.csrf import csrf_exempt
+
+from benchmarks.harness import REQUESTS, summarize
+
+CALLS = REQUESTS * 50
+CHAINS = {
+    'django': (
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.common.CommonMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    ),
+    'lean': (
+        'api.middleware.SiteSessionMiddleware',
+        'django.middleware.common.CommonMiddleware',
+        'api.middleware.SiteCsrfViewMiddleware',
+        'api.middleware.SiteAuthenticationMiddleware',
+        'api.middleware.SiteMessageMiddleware',
+        'api.middleware.SiteXFrameOptionsMiddleware',
+    ),
+}
+
+
+@csrf_exempt
+def view(request):
+    return HttpResponse('{}', content_type='application/json')
+
+
+def build_chain(paths):
+    """Цепочка middleware с вызовом process_view, как в BaseHandler."""
+    middlewares = []
+
+    def get_response(request):
+        for middleware in middlewares:
+            if hasattr(middleware, 'process_view'):
+                response = middleware.process_view(request, view, (), {})
+                if response is not None:
+                    return response
+        return view(request)
+
+    handler = get_response
+    for path in reversed(paths):
+        handler = import_string(path)(handler)
+        middlewares.insert(0, handler)
+    return handler
+
+
+@pytest.mark.parametrize('chain', tuple(CHAINS))
+def test_api_request(chain, benchmark_results):
+    handler = build_chain(CHAINS[chain])
+    factory = RequestFactory()
+    latencies = []
+    started = perf_counter()
+    for _ in range(CALLS):
+        request = factory.get(
+            '/api/v1/titles/', HTTP_AUTHORIZATION='Bearer token'
+        )
+        call_started = perf_counter()
+        response = handler(request)
+        latencies.append(perf_counter() - call_started)
+        assert response.status_code == 200
+    result = summarize(latencies, 0, perf_counter() - started, 1)
+    result['mean_us'] = round(sum(latencies) / CALLS * 10 ** 6, 2)
+    benchmark_results.append({'case': f'middleware_{chain}', **result})
+    print(
+        f'\n{chain}: в среднем {result["mean_us"]} мкс на запрос, '
+        f'p50 {result["p50_ms"]} мс, p99 {result["p99_ms"]} мс'
+    )
@@ -0,0 +1,28 @@
+"""
+Прогон запросов Postman-коллекции через живой сервер на небольшом
+синтетическом наборе данных.
+
+    python -m pytest benchmarks/test_replay.py -s
+
+Для замеров на полном наборе данных используйте benchmarks/replay.py.
+"""
+import pytest
+from django.core.management import call_command
+
+from benchmarks.harness import CONCURRENCY, REQUESTS
+from benchmarks.replay import load_scenarios, print_results, replay
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize('concurrency', CONCURRENCY)
+def test_replay(concurrency, live_server, benchmark_results):
+    call_command(
+        'generate_data', users=200, titles=200, reviews=2000, comments=4000,
+        seed=0, stdout=None
+    )
+    results = replay(
+        live_server.url, load_scenarios(), REQUESTS, concurrency, warmup=20
+    )
+    print_results(results)
+    benchmark_results.extend(results)
+    assert results[0]['errors'] == 0
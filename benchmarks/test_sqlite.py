@@ -0,0 +1,138 @@
+"""
+Чтение списков и отзывов во время записи комментариев
+с настройками SQLite по умолчанию и с настройками из settings.SQLITE.
+
+    python -m pytest benchmarks/test_sqlite.py -s
+
+Пока читатели выполняют BENCHMARK_REQUESTS запросов, WRITERS потоков
+непрерывно создают комментарии через API. В результат читателей
+добавляются число записей в секунду и число ошибок записи.
+"""
+import threading
+from time import perf_counter
+
+import pytest
+from django.db import connection, connections
+from django.test import Client
+
+from benchmarks.harness import CONCURRENCY, REQUESTS, run
+
+WRITERS = 2
+REVIEWS = 200
+# Настройки SQLite и Django по умолчанию.
+DEFAULT_SQLITE = {
+    'ENABLED': True,
+    'PRAGMAS': {'journal_mode': 'DELETE', 'synchronous': 'FULL'},
+}
+
+
+def get_profiles():
+    """Настройки SQLite и режим BEGIN повторяемых транзакций."""
+    from django.conf import settings
+
+    return {
+        'default': (DEFAULT_SQLITE, ''),
+        'tuned': (settings.SQLITE, 'IMMEDIATE'),
+    }
+
+
+class Writers:
+    """Потоки, создающие комментарии, пока их не остановят."""
+
+    def __init__(self, url, token, count=WRITERS):
+        self.url = url
+        self.token = token
+        self.stopped = threading.Event()
+        self.written = 0
+        self.errors = 0
+        self.lock = threading.Lock()
+        self.threads = [
+            threading.Thread(target=self.write) for _ in range(count)
+        ]
+
+    def write(self):
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        try:
+            while not self.stopped.is_set():
+                try:
+                    ok = client.post(
+                        self.url, data={'text': 'Комментарий'}
+                    ).status_code == 201
+                except Exception:
+                    ok = False
+                with self.lock:
+                    self.written += ok
+                    self.errors += not ok
+        finally:
+            connections.close_all()
+
+    def __enter__(self):
+        self.started = perf_counter()
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        for thread in self.threads:
+            thread.join()
+        self.elapsed = perf_counter() - self.started
+
+
+@pytest.fixture
+def review(settings, request, django_user_model):
+    """Отзывы к одному произведению в БД с PRAGMA выбранного профиля."""
+    from reviews.models import Review, Title
+
+    settings.API_CACHE = {**settings.API_CACHE, 'ENABLED': False}
+    settings.SQLITE, mode = get_profiles()[request.param]
+    settings.DB_LOCK_RETRY = {
+        **settings.DB_LOCK_RETRY, 'TRANSACTION_MODE': mode
+    }
+    # Новое соединение применяет PRAGMA профиля, journal_mode
+    # сохраняется в файле БД.
+    connection.close()
+    django_user_model.objects.bulk_create(
+        django_user_model(
+            username=f'reader{number}', email=f'reader{number}@yamdb.fake'
+        )
+        for number in range(REVIEWS)
+    )
+    title = Title.objects.create(name='Сталкер', year=1979)
+    Review.objects.bulk_create(
+        Review(title=title, author=author, text='Отзыв', score=7)
+        for author in django_user_model.objects.all()
+    )
+    return Review.objects.first()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize('review', ('default', 'tuned'), indirect=True)
+@pytest.mark.parametrize('concurrency', CONCURRENCY)
+def test_reads_during_writes(concurrency, review, request,
+                             benchmark_results):
+    from users.tokens import UserAccessToken
+
+    profile = request.node.callspec.params['review']
+    reviews_url = f'/api/v1/titles/{review.title_id}/reviews/'
+    comments_url = f'{reviews_url}{review.id}/comments/'
+    token = str(UserAccessToken.for_user(review.author))
+
+    def send(client, number):
+        if number % 2:
+            return client.get(f'{reviews_url}?limit=20&offset={number % 180}')
+        return client.get(f'{reviews_url}{review.id}/')
+
+    with Writers(comments_url, token) as writers:
+        result = run(send, REQUESTS, concurrency)
+    result['writes_per_s'] = round(writers.written / writers.elapsed, 2)
+    result['write_errors'] = writers.errors
+    benchmark_results.append({'case': f'reads_{profile}', **result})
+    print(
+        f'\n{profile}, потоков чтения: {concurrency}, записи: {WRITERS}: '
+        f'{result["rps"]} чтений/с, p95 {result["p95_ms"]} мс, '
+        f'ошибок чтения: {result["errors"]}; '
+        f'{result["writes_per_s"]} записей/с, '
+        f'ошибок записи: {result["write_errors"]}'
+    )
+    assert writers.written > 0
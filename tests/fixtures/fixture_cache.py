@@ -0,0 +1,31 @@
+import pytest
+from django.core.cache import caches
+
+
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    clear_caches()
+    yield
+    clear_caches()
+
+
+@pytest.fixture
+def api_cache(settings):
+    """
+    Кэш ответов и ETag включены. Тесты идут в одном процессе,
+    поэтому им подходит и кэш в памяти процесса.
+    """
+    settings.API_CACHE = {
+        **settings.API_CACHE, 'ENABLED': True, 'ETAGS': True
+    }
+
+
+@pytest.fixture
+def stateless_jwt(settings):
+    """Токены без запроса пользователя к БД, см. api_cache."""
+    settings.STATELESS_JWT = {**settings.STATELESS_JWT, 'ENABLED': True}
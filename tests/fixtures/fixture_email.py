@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def eager_email_outbox(settings):
+    """Письма отправляются сразу, чтобы их можно было найти в mail.outbox."""
+    settings.EMAIL_OUTBOX = {**settings.EMAIL_OUTBOX, 'EAGER': True}
@@ -0,0 +1,82 @@
+import re
+from collections import Counter
+from contextlib import ExitStack
+
+import pytest
+from django.db import connections
+from django.test.client import ClientHandler
+from django.test.utils import CaptureQueriesContext
+
+from tests.query_budgets import QUERY_BUDGETS
+
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+IN_LISTS = re.compile(r'IN \((?:\?, )*\?\)')
+# Управление транзакциями не считается: изменяющие запросы выполняются
+# в transaction.atomic (api/retry.py), а N+1 эти команды не показывают.
+TRANSACTION_CONTROL = re.compile(r'(BEGIN|SAVEPOINT|RELEASE|ROLLBACK)\b')
+
+
+def get_fingerprint(sql):
+    """Текст запроса без значений: одинаковые запросы с разными id совпадут."""
+    return IN_LISTS.sub('IN (...)', LITERALS.sub('?', sql))
+
+
+def get_budget_key(request):
+    match = request.resolver_match
+    method = request.method.lower()
+    actions = getattr(match.func, 'actions', None) or {}
+    return match.url_name, actions.get(method, method)
+
+
+def check_query_budget(request, queries):
+    """Проваливает тест, если вызов API превысил бюджет запросов к БД."""
+    if getattr(request, 'resolver_match', None) is None:
+        return
+    key = get_budget_key(request)
+    budget = QUERY_BUDGETS.get(key)
+    if budget is None:
+        pytest.fail(
+            f'Для {key} не задан бюджет запросов к БД '
+            f'в tests/query_budgets.py'
+        )
+    if len(queries) <= budget:
+        return
+    repeated = Counter(
+        get_fingerprint(query['sql']) for query in queries
+    ).most_common()
+    details = '\n'.join(
+        f'  {count} x {sql}' for sql, count in repeated if count > 1
+    ) or '  повторяющихся запросов нет'
+    pytest.fail(
+        f'{request.method} {request.get_full_path()} ({key}): '
+        f'{len(queries)} запросов к БД при бюджете {budget}.\n'
+        f'Повторяющиеся запросы:\n{details}',
+        pytrace=False
+    )
+
+
+@pytest.fixture(autouse=True)
+def query_budget(monkeypatch):
+    """Считает запросы к БД в каждом вызове API через тестовый клиент."""
+    get_response = ClientHandler.get_response
+
+    def get_response_within_budget(handler, request):
+        with ExitStack() as stack:
+            contexts = [
+                stack.enter_context(
+                    CaptureQueriesContext(connections[alias])
+                )
+                for alias in connections
+            ]
+            response = get_response(handler, request)
+        check_query_budget(request, [
+            query
+            for context in contexts
+            for query in context.captured_queries
+            if not TRANSACTION_CONTROL.match(query['sql'])
+        ])
+        return response
+
+    monkeypatch.setattr(
+        ClientHandler, 'get_response', get_response_within_budget
+    )
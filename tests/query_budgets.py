@@ -0,0 +1,57 @@
+"""
+Бюджеты запросов к БД для вызовов API через тестовый клиент.
+
+Ключ — имя маршрута и действие вьюсета (для обычных представлений и
+неразрешённых методов — HTTP-метод в нижнем регистре), значение —
+наибольшее допустимое число запросов к БД за один вызов, включая
+загрузку пользователя при аутентификации.
+"""
+
+QUERY_BUDGETS = {
+    ('categorie-list', 'list'): 3,
+    ('categorie-list', 'create'): 3,
+    ('categorie-detail', 'get'): 1,
+    ('categorie-detail', 'patch'): 1,
+    ('categorie-detail', 'destroy'): 5,
+    ('genre-list', 'list'): 3,
+    ('genre-list', 'create'): 3,
+    ('genre-detail', 'get'): 1,
+    ('genre-detail', 'patch'): 1,
+    ('genre-detail', 'destroy'): 4,
+    ('title-list', 'list'): 4,
+    # Жанры в SlugRelatedField(many=True) ищутся по одному.
+    ('title-list', 'create'): 10,
+    ('title-detail', 'retrieve'): 3,
+    ('title-detail', 'update'): 1,
+    ('title-detail', 'partial_update'): 6,
+    ('title-detail', 'destroy'): 9,
+    ('review-list', 'list'): 4,
+    ('review-list', 'create'): 6,
+    ('review-list', 'put'): 1,
+    ('review-detail', 'retrieve'): 3,
+    ('review-detail', 'update'): 1,
+    ('review-detail', 'partial_update'): 5,
+    ('review-detail', 'destroy'): 6,
+    ('comment-list', 'list'): 4,
+    ('comment-list', 'create'): 4,
+    ('comment-detail', 'post'): 0,
+    ('comment-detail', 'retrieve'): 3,
+    ('comment-detail', 'update'): 1,
+    ('comment-detail', 'partial_update'): 4,
+    ('comment-detail', 'destroy'): 4,
+    ('user-signup-list', 'create'): 6,
+    ('token-obtain', 'post'): 1,
+    ('user-list-create-list', 'list'): 3,
+    ('user-list-create-list', 'create'): 4,
+    ('user-detail-detail', 'retrieve'): 2,
+    ('user-detail-detail', 'update'): 1,
+    ('user-detail-detail', 'partial_update'): 4,
+    ('user-detail-detail', 'destroy'): 8,
+    ('user-me-detail', 'retrieve'): 1,
+    ('user-me-detail', 'partial_update'): 3,
+    ('user-me-detail', 'delete'): 1,
+    ('metrics', 'get'): 0,
+    # Страница входа в админку без сессии.
+    ('login', 'get'): 0,
+    ('login', 'post'): 0,
+}
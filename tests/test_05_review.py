@@ -95,13 +95,18 @@ class Test05ReviewAPI:
             'text': 'Неочень',
             'score': 5
         }
-        create_single_review(
+        response = create_single_review(
             admin_client,
             titles[0]['id'],
             post_data['text'],
             post_data['score']
         )
         title_0_reviews_count += 1
+        assert response.json().get('title') == titles[0]['id'], (
+            'Проверьте, что POST-запрос к '
+            f'`{self.REVIEWS_URL_TEMPLATE}` возвращает в поле `title` '
+            'id произведения целым числом.'
+        )
 
         data = {
             'text': 'Шляпа',
@@ -84,6 +84,11 @@ class Test06CommentAPI:
             'объекта. Сейчас поля `id` нет найдено в ответе или не является '
             'целым числом.'
         )
+        assert response.json().get('review') == reviews[0]['id'], (
+            'Проверьте, что POST-запрос к '
+            f'`{self.COMMENTS_URL_TEMPLATE}` возвращает в поле `review` '
+            'id отзыва целым числом.'
+        )
 
         response = admin_client.post(
             self.COMMENTS_URL_TEMPLATE.format(title_id='999', review_id='999'),
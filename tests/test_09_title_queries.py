@@ -0,0 +1,43 @@
+import pytest
+
+from tests.utils import create_categories, create_genre
+
+TITLES_LIST_QUERIES = 3
+TITLE_DETAIL_QUERIES = 2
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def create_many_titles(self, admin_client, count):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        for number in range(count):
+            admin_client.post(self.TITLES_URL, data={
+                'name': f'Произведение {number}',
+                'year': 2000,
+                'genre': [genre['slug'] for genre in genres],
+                'category': categories[number % 2]['slug'],
+            })
+
+    @pytest.mark.parametrize('limit', (1, 5, 20))
+    def test_01_titles_list_query_count(self, client, admin_client,
+                                        django_assert_num_queries, limit):
+        self.create_many_titles(admin_client, 20)
+        with django_assert_num_queries(TITLES_LIST_QUERIES):
+            response = client.get(f'{self.TITLES_URL}?limit={limit}')
+        assert len(response.json()['results']) == limit, (
+            f'Проверьте, что `{self.TITLES_URL}` учитывает параметр `limit`.'
+        )
+
+    def test_02_title_detail_query_count(self, client, admin_client,
+                                         django_assert_num_queries):
+        self.create_many_titles(admin_client, 1)
+        title_id = client.get(self.TITLES_URL).json()['results'][0]['id']
+        with django_assert_num_queries(TITLE_DETAIL_QUERIES):
+            client.get(
+                self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+            )
@@ -0,0 +1,132 @@
+import json
+from base64 import urlsafe_b64encode
+from http import HTTPStatus
+
+import pytest
+
+
+def walk_pages(client, url, direction='next'):
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что при пагинации по курсору в ответе нет ключа '
+            '`count`: количество объектов не должно подсчитываться.'
+        )
+        pages.append(data['results'])
+        url = data[direction]
+    return pages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10KeysetPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    @pytest.fixture
+    def titles(self):
+        from reviews.models import Title
+
+        return [
+            Title.objects.create(name=name, year=2000)
+            for name in ('Б', 'А', 'В', 'А', 'Г', 'Б', 'Д')
+        ]
+
+    @pytest.fixture
+    def reviews(self, titles, django_user_model):
+        from reviews.models import Review
+
+        title = titles[0]
+        for number in range(7):
+            author = django_user_model.objects.create_user(
+                username=f'reviewer{number}',
+                email=f'reviewer{number}@yamdb.fake'
+            )
+            Review.objects.create(
+                title=title, author=author, text=f'Отзыв {number}', score=5
+            )
+        return title.reviews.order_by('pub_date', 'id')
+
+    def test_01_titles_cursor_walk(self, client, titles):
+        expected = sorted((title.name, title.id) for title in titles)
+        pages = walk_pages(client, f'{self.TITLES_URL}?pagination=cursor'
+                                   '&limit=2')
+        assert [len(page) for page in pages] == [2, 2, 2, 1], (
+            'Проверьте, что пагинация по курсору отдаёт страницы размера '
+            '`limit` до последнего объекта.'
+        )
+        result = [(item['name'], item['id']) for page in pages
+                  for item in page]
+        assert result == expected, (
+            'Проверьте, что при пагинации по курсору произведения идут в '
+            'порядке (`name`, `id`) без пропусков и повторов.'
+        )
+
+        last_page = client.get(
+            f'{self.TITLES_URL}?pagination=cursor&limit=2'
+        ).json()
+        while last_page['next']:
+            last_page = client.get(last_page['next']).json()
+        pages = walk_pages(client, last_page['previous'], 'previous')
+        result = [(item['name'], item['id']) for page in reversed(pages)
+                  for item in page]
+        assert result == expected[:-1], (
+            'Проверьте, что ссылка `previous` при пагинации по курсору '
+            'возвращает предыдущие страницы.'
+        )
+
+    def test_02_reviews_cursor_walk(self, client, reviews):
+        url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=reviews[0].title_id
+        )
+        pages = walk_pages(client, f'{url}?pagination=cursor&limit=3')
+        result = [item['id'] for page in pages for item in page]
+        assert result == [review.id for review in reviews], (
+            'Проверьте, что при пагинации по курсору отзывы идут в порядке '
+            '(`pub_date`, `id`).'
+        )
+
+    def test_03_limit_offset_is_default(self, client, titles):
+        data = client.get(self.TITLES_URL).json()
+        assert data['count'] == len(titles), (
+            'Проверьте, что без параметра `pagination=cursor` используется '
+            'пагинация limit/offset.'
+        )
+
+    def test_04_invalid_cursor(self, client, titles):
+        response = client.get(f'{self.TITLES_URL}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что запрос с некорректным курсором возвращает ответ '
+            'со статусом 404.'
+        )
+
+    @pytest.mark.parametrize('position', (
+        ['garbage', 1],
+        [{'a': 1}, 1],
+        ['2020-01-01', 'abc'],
+        ['2020-01-01T00:00:00', None],
+    ))
+    def test_05_crafted_cursor(self, client, reviews, position):
+        cursor = urlsafe_b64encode(json.dumps({'p': position}).encode())
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=reviews[0].title_id)
+        response = client.get(f'{url}?cursor={cursor.decode()}')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что запрос с курсором, значения которого не '
+            'подходят к полям сортировки, возвращает ответ со статусом 404.'
+        )
+
+    def test_06_users_cursor_walk(self, admin_client, admin, user,
+                                  moderator):
+        pages = walk_pages(admin_client, '/api/v1/users/?pagination=cursor'
+                                         '&limit=1')
+        result = [item['username'] for page in pages for item in page]
+        assert result == [admin.username, user.username, moderator.username], (
+            'Проверьте, что при пагинации по курсору пользователи идут в '
+            'порядке `id`.'
+        )
@@ -0,0 +1,91 @@
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    @pytest.fixture
+    def titles(self):
+        from reviews.models import Title
+
+        return {
+            'war': Title.objects.create(
+                name='Война и мир', year=1869, description='Роман-эпопея'
+            ),
+            'hedgehog': Title.objects.create(
+                name='Ёжик в тумане', year=1975,
+                description='Мультфильм о войне с туманом'
+            ),
+            'peace': Title.objects.create(
+                name='Мирный воин', year=2006, description='Фильм'
+            ),
+        }
+
+    def search(self, client, text):
+        response = client.get(self.TITLES_URL, {'search': text})
+        return [title['id'] for title in response.json()['results']]
+
+    def test_01_search_is_ranked_and_inflection_aware(self, client, titles):
+        found = self.search(client, 'войны')
+        assert found == [titles['war'].id, titles['hedgehog'].id], (
+            'Проверьте, что фильтр `search` находит произведения по другой '
+            'форме слова и ставит совпадения в названии выше совпадений в '
+            'описании.'
+        )
+        assert self.search(client, 'ежик') == [titles['hedgehog'].id], (
+            'Проверьте, что фильтр `search` не различает буквы `е` и `ё`.'
+        )
+        assert self.search(client, 'мирный воин') == [titles['peace'].id], (
+            'Проверьте, что фильтр `search` требует совпадения всех слов '
+            'запроса.'
+        )
+        assert self.search(client, '"*') == [], (
+            'Проверьте, что запрос без слов ничего не находит.'
+        )
+
+    def test_02_search_index_follows_changes(self, client, admin_client,
+                                             titles):
+        title_id = titles['peace'].id
+        admin_client.patch(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title_id),
+            data={'name': 'Воин света'}
+        )
+        assert self.search(client, 'мирный') == [], (
+            'Проверьте, что после изменения названия произведение не '
+            'находится по старому названию.'
+        )
+        assert self.search(client, 'света') == [title_id], (
+            'Проверьте, что после изменения названия произведение находится '
+            'по новому названию.'
+        )
+        admin_client.delete(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert self.search(client, 'света') == [], (
+            'Проверьте, что удалённое произведение не находится поиском.'
+        )
+
+    def test_03_name_filter_is_kept(self, client, titles):
+        response = client.get(self.TITLES_URL, {'name': 'Война'})
+        assert [title['id'] for title in response.json()['results']] == [
+            titles['war'].id
+        ], 'Проверьте, что фильтр `name` по-прежнему работает.'
+
+    def test_04_search_ignores_cursor_pagination(self, client, titles):
+        response = client.get(
+            self.TITLES_URL, {'search': 'войны', 'pagination': 'cursor'}
+        )
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [
+            titles['war'].id, titles['hedgehog'].id
+        ], (
+            'Проверьте, что с фильтром `search` результаты упорядочены по '
+            'релевантности и при `pagination=cursor`.'
+        )
+        assert data['count'] == 2, (
+            'Проверьте, что с фильтром `search` используется пагинация '
+            'limit/offset.'
+        )
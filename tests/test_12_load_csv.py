@@ -0,0 +1,137 @@
+import csv
+import os
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from tests.conftest import MANAGE_PATH
+
+DATA_PATH = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+def count_rows(name_file):
+    with open(os.path.join(DATA_PATH, name_file), encoding='utf-8') as f:
+        return sum(1 for _ in csv.DictReader(f))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12LoadCsv:
+
+    def test_01_load_all(self, django_user_model):
+        from reviews.models import Comment, Review, Title
+        from reviews.ratings import get_inconsistent_titles
+
+        out = StringIO()
+        call_command('load_csv', '--all', '--batch-size', '7', stdout=out)
+        output = out.getvalue()
+        assert 'Таблицы загружены' in output, (
+            'Проверьте, что команда `load_csv --all` загружает таблицы: '
+            f'{output}'
+        )
+        assert 'строк/с' in output, (
+            'Проверьте, что команда `load_csv` сообщает скорость загрузки '
+            'каждой таблицы.'
+        )
+        expected = {
+            django_user_model: 'users.csv',
+            Title: 'titles.csv',
+            Review: 'review.csv',
+            Comment: 'comments.csv',
+            Title.genre.through: 'genre_title.csv',
+        }
+        for model, name_file in expected.items():
+            assert model.objects.count() == count_rows(name_file), (
+                f'Проверьте, что команда `load_csv` загружает все строки '
+                f'`{name_file}`.'
+            )
+        assert not get_inconsistent_titles().exists(), (
+            'Проверьте, что после загрузки csv рейтинги произведений '
+            'совпадают с отзывами.'
+        )
+
+    def test_02_clear(self, django_user_model):
+        from django.contrib.admin.models import ADDITION, LogEntry
+        from reviews.models import Review, Title
+
+        call_command('load_csv', '--all', stdout=StringIO())
+        LogEntry.objects.create(
+            user=django_user_model.objects.first(),
+            object_repr='title', action_flag=ADDITION
+        )
+        call_command('load_csv', '--clear', '--vacuum', stdout=StringIO())
+        for model in (django_user_model, Title, Review, Title.genre.through,
+                      LogEntry):
+            assert not model.objects.exists(), (
+                'Проверьте, что команда `load_csv --clear` очищает таблицы '
+                'и ссылающиеся на них записи.'
+            )
+        title = Title.objects.create(name='Первое', year=2000)
+        assert title.id == 1, (
+            'Проверьте, что команда `load_csv --clear` сбрасывает счётчики '
+            'первичных ключей.'
+        )
+
+    def test_03_upsert(self, tmp_path, django_user_model):
+        from reviews.models import Review, Title
+        from reviews.ratings import get_inconsistent_titles
+
+        call_command('load_csv', '--all', stdout=StringIO())
+        changed_review = Review.objects.order_by('id').first()
+        new_score = 1 if changed_review.score != 1 else 2
+        unchanged_review = Review.objects.exclude(
+            title=changed_review.title
+        ).order_by('id').first()
+        other_title = Title.objects.exclude(
+            pk__in=(changed_review.title_id, unchanged_review.title_id)
+        ).order_by('id').first()
+        author = django_user_model.objects.exclude(
+            review__title=other_title
+        ).order_by('id').first()
+        untouched_title = Title.objects.exclude(pk__in=(
+            changed_review.title_id, unchanged_review.title_id,
+            other_title.id
+        )).filter(rating_count__gt=0).order_by('id').first()
+        Title.objects.filter(pk=untouched_title.pk).update(rating_sum=0)
+        new_review_id = Review.objects.order_by('-id').first().id + 1
+
+        with open(tmp_path / 'review.csv', 'w', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                ('id', 'title_id', 'text', 'author', 'score', 'pub_date')
+            )
+            for review, score in ((changed_review, new_score),
+                                  (unchanged_review, unchanged_review.score)):
+                writer.writerow((review.id, review.title_id, review.text,
+                                 review.author_id, score, ''))
+            writer.writerow((new_review_id, other_title.id, 'Новый отзыв',
+                             author.id, 10, ''))
+        with open(tmp_path / 'titles.csv', 'w', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(('id', 'name', 'year', 'category'))
+            writer.writerow((other_title.id, 'Новое название',
+                             other_title.year, other_title.category_id))
+
+        review_count = Review.objects.count()
+        out = StringIO()
+        call_command('load_csv', '--upsert', '--path', str(tmp_path),
+                     stdout=out)
+        output = out.getvalue()
+        assert 'Изменения применены' in output, (
+            'Проверьте, что команда `load_csv --upsert` применяет дельту: '
+            f'{output}'
+        )
+        assert 'новых: 1, изменённых: 1' in output, (
+            'Проверьте, что `load_csv --upsert` создаёт новые строки и '
+            'обновляет только изменившиеся.'
+        )
+        assert Review.objects.count() == review_count + 1
+        assert Review.objects.get(pk=changed_review.pk).score == new_score
+        assert Title.objects.get(pk=other_title.pk).name == 'Новое название'
+        inconsistent = set(
+            get_inconsistent_titles().values_list('pk', flat=True)
+        )
+        assert inconsistent == {untouched_title.pk}, (
+            'Проверьте, что `load_csv --upsert` пересчитывает рейтинг только '
+            'у произведений, затронутых дельтой.'
+        )
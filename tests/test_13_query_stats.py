@@ -0,0 +1,57 @@
+import logging
+import re
+
+import pytest
+from django.test import Client
+
+SERVER_TIMING_PATTERN = re.compile(
+    r'db;dur=(?P<db>[\d.]+);desc="(?P<count>\d+) queries", '
+    r'app;dur=[\d.]+'
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13QueryStats:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture(autouse=True)
+    def title(self):
+        from reviews.models import Title
+
+        return Title.objects.create(name='Сталкер', year=1979)
+
+    def test_01_server_timing_header(self, client):
+        response = client.get(self.TITLES_URL)
+        match = SERVER_TIMING_PATTERN.fullmatch(
+            response.get('Server-Timing', '')
+        )
+        assert match, (
+            'Проверьте, что ответ содержит заголовок `Server-Timing` с '
+            'количеством запросов к БД и временем SQL.'
+        )
+        assert int(match['count']) == 3, (
+            'Проверьте, что в `Server-Timing` указано количество запросов к '
+            'БД, выполненных при обработке запроса.'
+        )
+
+    def test_02_budget_exceeded_is_logged(self, settings, caplog):
+        settings.QUERY_STATS = {
+            'ENABLED': True, 'MAX_QUERIES': 1, 'MAX_SQL_TIME_MS': 1000,
+        }
+        with caplog.at_level(logging.WARNING, logger='api.performance'):
+            Client().get(self.TITLES_URL)
+        assert any(
+            self.TITLES_URL in record.getMessage()
+            for record in caplog.records
+        ), 'Проверьте, что запросы сверх бюджета попадают в лог.'
+
+    def test_03_disabled(self, settings):
+        settings.QUERY_STATS = {
+            'ENABLED': False, 'MAX_QUERIES': 1, 'MAX_SQL_TIME_MS': 1000,
+        }
+        response = Client().get(self.TITLES_URL)
+        assert 'Server-Timing' not in response, (
+            'Проверьте, что выключенный через `QUERY_STATS` подсчёт запросов '
+            'не добавляет заголовок `Server-Timing`.'
+        )
@@ -0,0 +1,100 @@
+import re
+import threading
+
+import pytest
+
+
+def get_sample(text, name, **labels):
+    for line in text.splitlines():
+        if line.startswith('#') or not line.startswith(name):
+            continue
+        sample, value = line.rsplit(' ', 1)
+        if sample.split('{')[0] != name:
+            continue
+        sample_labels = dict(re.findall(r'(\w+)="([^"]*)"', sample))
+        if all(sample_labels.get(key) == str(value_)
+               for key, value_ in labels.items()):
+            return float(value)
+    return None
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14Metrics:
+
+    METRICS_URL = '/metrics'
+
+    def test_01_metrics_endpoint(self, client, user_client):
+        before = get_sample(
+            client.get(self.METRICS_URL).content.decode(),
+            'api_requests_total', view='TitleViewSet', action='list',
+            status=200
+        ) or 0
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+        user_client.get('/api/v1/users/me/')
+        client.post('/api/v1/auth/signup/', data={})
+
+        response = client.get(self.METRICS_URL)
+        assert response.status_code == 200, (
+            f'Проверьте, что эндпоинт `{self.METRICS_URL}` доступен.'
+        )
+        assert response['Content-Type'].startswith('text/plain'), (
+            f'Проверьте, что `{self.METRICS_URL}` отдаёт метрики в текстовом '
+            'формате Prometheus.'
+        )
+        text = response.content.decode()
+        assert get_sample(
+            text, 'api_requests_total', view='TitleViewSet', action='list',
+            method='GET', status=200
+        ) == before + 2, (
+            'Проверьте, что метрика `api_requests_total` считает запросы по '
+            'представлению, действию и статусу.'
+        )
+        assert get_sample(
+            text, 'api_request_duration_seconds_count',
+            view='UserAccountViewSet', action='retrieve', status=200
+        ), 'Проверьте, что собирается гистограмма времени ответа.'
+        assert get_sample(
+            text, 'api_request_duration_seconds_bucket',
+            view='UserSignupViewSet', action='create', status=400, le='+Inf'
+        ), (
+            'Проверьте, что гистограмма времени ответа содержит корзину '
+            '`+Inf` и учитывает статус ответа.'
+        )
+        assert get_sample(
+            text, 'api_request_db_queries_count', view='TitleViewSet',
+            action='list'
+        ), 'Проверьте, что собирается гистограмма запросов к БД.'
+
+    def test_02_metrics_disabled(self, client, settings):
+        settings.METRICS = {'ENABLED': False}
+        assert client.get(self.METRICS_URL).status_code == 404, (
+            f'Проверьте, что выключенный `{self.METRICS_URL}` отдаёт 404.'
+        )
+
+
+def test_histogram_threads():
+    from api.metrics import Histogram, Registry
+
+    registry = Registry()
+    histogram = Histogram(
+        'test_seconds', 'Тест.', ('worker',), buckets=(1, 2),
+        registry=registry
+    )
+
+    def observe():
+        for value in (0.5, 1.5, 3) * 1000:
+            histogram.observe(value, ('w',))
+
+    threads = [threading.Thread(target=observe) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    text = registry.render()
+    assert get_sample(text, 'test_seconds_bucket', le='1') == 8000
+    assert get_sample(text, 'test_seconds_bucket', le='2') == 16000
+    assert get_sample(text, 'test_seconds_bucket', le='+Inf') == 24000
+    assert get_sample(text, 'test_seconds_count') == 24000
+    assert get_sample(text, 'test_seconds_sum') == 8 * 1000 * 5.0
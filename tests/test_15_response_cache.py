@@ -0,0 +1,165 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.fixture(params=('locmem', 'filebased'))
+def cache_backend(request, settings, tmp_path):
+    if request.param == 'filebased':
+        settings.CACHES = {
+            **settings.CACHES,
+            'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.'
+                           'FileBasedCache',
+                'LOCATION': str(tmp_path / 'cache'),
+            }
+        }
+    return request.param
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('api_cache')
+class Test15ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_anonymous_reads_are_cached(self, cache_backend, client,
+                                           admin_client,
+                                           django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        for url in (self.TITLES_URL, detail_url, '/api/v1/genres/'):
+            expected = client.get(url).json()
+            with django_assert_num_queries(0):
+                response = client.get(url)
+            assert response.json() == expected, (
+                f'Проверьте, что повторный анонимный GET-запрос к `{url}` '
+                'отдаётся из кэша без запросов к БД.'
+            )
+
+    def test_02_writes_invalidate_cache(self, cache_backend, client,
+                                        admin_client, user_client):
+        titles, _, genres = create_titles(admin_client)
+        title_id = titles[0]['id']
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        client.get(self.TITLES_URL)
+        client.get(detail_url)
+        client.get(reviews_url)
+
+        admin_client.patch(detail_url, data={'name': 'Новое название'})
+        assert client.get(detail_url).json()['name'] == 'Новое название', (
+            'Проверьте, что изменение произведения сбрасывает кэш его '
+            'страницы.'
+        )
+
+        create_single_review(user_client, title_id, 'Отзыв', 8)
+        assert client.get(detail_url).json()['rating'] == 8, (
+            'Проверьте, что новый отзыв сбрасывает кэш рейтинга '
+            'произведения.'
+        )
+        assert client.get(reviews_url).json()['count'] == 1, (
+            'Проверьте, что новый отзыв сбрасывает кэш списка отзывов.'
+        )
+
+        admin_client.delete(f'/api/v1/genres/{genres[0]["slug"]}/')
+        genre_slugs = {
+            genre['slug'] for genre in client.get(detail_url).json()['genre']
+        }
+        assert genres[0]['slug'] not in genre_slugs, (
+            'Проверьте, что удаление жанра сбрасывает кэш произведений.'
+        )
+
+        admin_client.delete(detail_url)
+        assert client.get(reviews_url).status_code == 404, (
+            'Проверьте, что после удаления произведения его отзывы больше '
+            'не отдаются из кэша.'
+        )
+
+    def test_03_authenticated_reads_are_not_cached(
+        self, cache_backend, admin_client, django_assert_max_num_queries
+    ):
+        create_titles(admin_client)
+        admin_client.get(self.TITLES_URL)
+        with django_assert_max_num_queries(10) as captured:
+            admin_client.get(self.TITLES_URL)
+        assert len(captured) > 0, (
+            'Проверьте, что ответы авторизованным пользователям не '
+            'кэшируются.'
+        )
+
+    def test_04_versions_bumped_after_commit(self, client):
+        from django.db import transaction
+
+        from api.cache import get_versions
+        from reviews.models import Title
+
+        before = get_versions(('titles',))
+        with transaction.atomic():
+            Title.objects.create(name='Сталкер', year=1979)
+            assert get_versions(('titles',)) == before, (
+                'Проверьте, что версия коллекции не меняется до фиксации '
+                'транзакции: иначе параллельный запрос закэширует старые '
+                'данные под новой версией.'
+            )
+        assert get_versions(('titles',)) != before, (
+            'Проверьте, что после фиксации транзакции версия коллекции '
+            'увеличивается.'
+        )
+
+    def test_05_rebuild_ratings_invalidates_cache(self, client,
+                                                  admin_client, user_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Отзыв', 8)
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        Title.objects.filter(pk=title_id).update(
+            rating_sum=0, rating_count=0, rating=None
+        )
+        assert client.get(detail_url).json()['rating'] is None
+        call_command('rebuild_ratings', stdout=StringIO())
+        assert client.get(detail_url).json()['rating'] == 8, (
+            'Проверьте, что `rebuild_ratings` сбрасывает кэш ответов.'
+        )
+
+    def test_06_cache_key_includes_host(self, client, admin_client):
+        create_titles(admin_client)
+        url = f'{self.TITLES_URL}?limit=1'
+        client.get(url, HTTP_HOST='evil.example')
+        response = client.get(url)
+        assert response.json()['next'].startswith('http://testserver/'), (
+            'Проверьте, что ответы, закэшированные для одного хоста, не '
+            'отдаются запросам к другому: ссылки пагинации абсолютные.'
+        )
+
+    def test_07_shared_cache_required(self, settings, tmp_path):
+        from django.core.exceptions import ImproperlyConfigured
+
+        from api.cache import check_caches
+
+        settings.CACHES = {**settings.CACHES, 'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }}
+        with pytest.raises(ImproperlyConfigured):
+            check_caches()
+        settings.API_CACHE = {
+            **settings.API_CACHE, 'ENABLED': False, 'ETAGS': False
+        }
+        check_caches()
+        settings.API_CACHE = {
+            **settings.API_CACHE, 'ENABLED': True, 'ETAGS': True
+        }
+        settings.CACHES = {**settings.CACHES, 'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path / 'cache'),
+        }}
+        check_caches()
@@ -0,0 +1,120 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('api_cache')
+class Test16ETag:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_not_modified(self, client, admin_client,
+                             django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        for url in (self.TITLES_URL, detail_url, '/api/v1/categories/'):
+            etag = client.get(url)['ETag']
+            assert etag.startswith('"'), (
+                f'Проверьте, что GET-запрос к `{url}` возвращает сильный '
+                'ETag.'
+            )
+            with django_assert_num_queries(0):
+                response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что GET-запрос к `{url}` с совпадающим '
+                '`If-None-Match` возвращает ответ со статусом 304 без '
+                'запросов к БД.'
+            )
+            assert response['ETag'] == etag
+            assert not response.content
+
+    def test_02_authenticated_not_modified(self, admin_client):
+        create_titles(admin_client)
+        etag = admin_client.get(self.TITLES_URL)['ETag']
+        response = admin_client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что условный GET-запрос авторизованного пользователя '
+            'тоже возвращает ответ со статусом 304.'
+        )
+
+    def test_03_writes_change_etag(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        etag = client.get(detail_url)['ETag']
+        admin_client.patch(detail_url, data={'name': 'Новое название'})
+        response = client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения произведения условный '
+            'GET-запрос возвращает новые данные.'
+        )
+        assert response['ETag'] != etag
+
+    def test_04_reviews_etag_per_title(self, client, admin_client,
+                                       user_client):
+        titles, _, _ = create_titles(admin_client)
+        first_url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        second_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[1]['id']
+        )
+        review = create_single_review(
+            user_client, titles[0]['id'], 'Отзыв', 5
+        ).json()
+        first_etag = client.get(first_url)['ETag']
+        second_etag = client.get(second_url)['ETag']
+
+        admin_client.patch(
+            f'{first_url}{review["id"]}/', data={'text': 'Новый текст'}
+        )
+        response = client.get(first_url, HTTP_IF_NONE_MATCH=first_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение отзыва меняет ETag отзывов '
+            'произведения.'
+        )
+        response = client.get(second_url, HTTP_IF_NONE_MATCH=second_etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что изменение отзыва не меняет ETag отзывов других '
+            'произведений.'
+        )
+
+    def test_05_weak_and_wildcard_match(self, client, admin_client):
+        create_titles(admin_client)
+        etag = client.get(self.TITLES_URL)['ETag']
+        for header in (f'W/{etag}', f'"other", {etag}', '*'):
+            response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=header)
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                'Проверьте, что `If-None-Match` сравнивается по слабому '
+                f'сравнению и поддерживает список и `*`: `{header}`.'
+            )
+        response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH='"other"')
+        assert response.status_code == HTTPStatus.OK
+
+    def test_06_wildcard_missing_resource(self, client, admin_client,
+                                          user_client):
+        titles, _, _ = create_titles(admin_client)
+        review = create_single_review(
+            user_client, titles[0]['id'], 'Отзыв', 7
+        ).json()
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        for url in (
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=999),
+            self.REVIEWS_URL_TEMPLATE.format(title_id=999),
+            f'{reviews_url}999/',
+            f'{reviews_url}999/comments/',
+            f'{reviews_url}{review["id"]}/comments/999/',
+        ):
+            response = client.get(url, HTTP_IF_NONE_MATCH='*')
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                'Проверьте, что `If-None-Match: *` для несуществующего '
+                f'ресурса `{url}` возвращает ответ со статусом 404.'
+            )
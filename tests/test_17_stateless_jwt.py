@@ -0,0 +1,167 @@
+import csv
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tests.utils import create_single_review, create_titles
+
+
+def make_client(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+        'статусом 200.'
+    )
+    return len(context)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('stateless_jwt')
+class Test17StatelessJWT:
+
+    URL_TOKEN = '/api/v1/auth/token/'
+    URL_USERS = '/api/v1/users/'
+
+    @pytest.fixture
+    def stateless_token(self):
+        from users.tokens import UserAccessToken
+
+        return lambda user: str(UserAccessToken.for_user(user))
+
+    def test_01_token_contains_claims(self, client, user):
+        user.confirmation_code = 'code'
+        user.save()
+        response = client.post(self.URL_TOKEN, data={
+            'username': user.username, 'confirmation_code': 'code'
+        })
+        token = AccessToken(response.json()['token'])
+        assert (token['role'], token['username'], token['is_superuser']) == (
+            user.role, user.username, user.is_superuser
+        ), (
+            f'Проверьте, что токен от `{self.URL_TOKEN}` содержит роль, имя '
+            'пользователя и признак суперпользователя.'
+        )
+
+    def test_02_no_user_query(self, admin, admin_client, stateless_token):
+        stateless_client = make_client(stateless_token(admin))
+        assert (
+            count_queries(stateless_client, self.URL_USERS)
+            == count_queries(admin_client, self.URL_USERS) - 1
+        ), (
+            'Проверьте, что пользователь с токеном, содержащим роль, '
+            'не загружается из БД.'
+        )
+
+    def test_03_role_change_revokes_token(self, admin, stateless_token):
+        client = make_client(stateless_token(admin))
+        assert client.get(self.URL_USERS).status_code == HTTPStatus.OK
+        admin.role = 'user'
+        admin.save()
+        response = client.get(self.URL_USERS)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что после смены роли выпущенный ранее токен не даёт '
+            'прежних прав.'
+        )
+
+    def test_04_deletion_revokes_token(self, admin, stateless_token):
+        client = make_client(stateless_token(admin))
+        admin.delete()
+        response = client.get(self.URL_USERS)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токен удалённого пользователя не принимается.'
+        )
+
+    def test_05_author_permissions(self, admin_client, user, moderator,
+                                   stateless_token):
+        titles, _, _ = create_titles(admin_client)
+        author_client = make_client(stateless_token(user))
+        review = create_single_review(
+            author_client, titles[0]['id'], 'Отзыв', 5
+        ).json()
+        assert review['author'] == user.username
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{review["id"]}/'
+        response = author_client.patch(url, data={'text': 'Новый текст'})
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что автор с токеном без запроса к БД может изменить '
+            'свой отзыв.'
+        )
+        moderator_client = make_client(stateless_token(moderator))
+        response = moderator_client.delete(url)
+        assert response.status_code == HTTPStatus.NO_CONTENT, (
+            'Проверьте, что модератор с токеном без запроса к БД может '
+            'удалить чужой отзыв.'
+        )
+
+    def test_06_me(self, user, stateless_token):
+        client = make_client(stateless_token(user))
+        response = client.get(f'{self.URL_USERS}me/')
+        assert response.json()['bio'] == user.bio, (
+            'Проверьте, что `/api/v1/users/me/` возвращает данные '
+            'пользователя из БД.'
+        )
+        response = client.patch(f'{self.URL_USERS}me/', data={'bio': 'Новое'})
+        assert response.status_code == HTTPStatus.OK
+
+    def test_07_revocation_not_evicted(self, admin, stateless_token):
+        client = make_client(stateless_token(admin))
+        admin.role = 'user'
+        admin.save()
+        for number in range(1000):
+            cache.set(f'response:{number}', number)
+        response = client.get(self.URL_USERS)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что отметки отзыва токенов не вытесняются из кэша '
+            'ответами API.'
+        )
+
+    def test_08_upsert_revokes_token(self, admin, stateless_token,
+                                     tmp_path):
+        client = make_client(stateless_token(admin))
+        with open(tmp_path / 'users.csv', 'w', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(('id', 'username', 'email', 'role'))
+            writer.writerow((admin.id, admin.username, admin.email, 'user'))
+        call_command(
+            'load_csv', '--upsert', '--path', str(tmp_path), stdout=StringIO()
+        )
+        response = client.get(self.URL_USERS)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что `load_csv --upsert` отзывает токены '
+            'пользователей, у которых изменилась роль.'
+        )
+
+    def test_09_clear_revokes_tokens(self, admin, stateless_token):
+        client = make_client(stateless_token(admin))
+        call_command('load_csv', '--clear', stdout=StringIO())
+        response = client.get(self.URL_USERS)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после `load_csv --clear` токены удалённых '
+            'пользователей не принимаются.'
+        )
+
+    def test_10_shared_cache_required(self, settings, tmp_path):
+        from django.core.exceptions import ImproperlyConfigured
+
+        from api.cache import check_caches
+
+        with pytest.raises(ImproperlyConfigured):
+            check_caches()
+        settings.CACHES = {**settings.CACHES, 'tokens': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path / 'tokens'),
+        }}
+        check_caches()
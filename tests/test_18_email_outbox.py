@@ -0,0 +1,118 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+
+
+class CountingBackend(EmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return super().open()
+
+
+class FailingBackend(EmailBackend):
+
+    def send_messages(self, messages):
+        raise ConnectionError('Почтовый сервер недоступен')
+
+
+@pytest.fixture
+def deferred_outbox(settings):
+    settings.EMAIL_OUTBOX = {**settings.EMAIL_OUTBOX, 'EAGER': False}
+
+
+def signup(client, number):
+    response = client.post(SIGNUP_URL, data={
+        'username': f'user{number}', 'email': f'user{number}@yamdb.fake'
+    })
+    assert response.status_code == HTTPStatus.OK
+    return response
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18EmailOutbox:
+
+    def test_01_signup_enqueues_email(self, client, deferred_outbox):
+        from users.models import OutgoingEmail
+
+        signup(client, 1)
+        assert not mail.outbox, (
+            'Проверьте, что регистрация не отправляет письмо в запросе.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == 'user1@yamdb.fake'
+
+        call_command('send_emails', '--once')
+        assert [message.to for message in mail.outbox] == [
+            ['user1@yamdb.fake']
+        ], (
+            'Проверьте, что команда `send_emails` отправляет письма из '
+            'очереди.'
+        )
+        assert not OutgoingEmail.objects.exists(), (
+            'Проверьте, что отправленные письма удаляются из очереди.'
+        )
+
+    def test_02_single_connection(self, client, settings, deferred_outbox):
+        settings.EMAIL_BACKEND = (
+            'tests.test_18_email_outbox.CountingBackend'
+        )
+        CountingBackend.opened = 0
+        for number in range(5):
+            signup(client, number)
+        call_command('send_emails', '--once', '--batch-size', '10')
+        assert len(mail.outbox) == 5
+        assert CountingBackend.opened == 1, (
+            'Проверьте, что пачка писем отправляется через одно соединение.'
+        )
+
+    def test_03_retry_with_backoff(self, client, settings, deferred_outbox):
+        from users.models import OutgoingEmail
+
+        settings.EMAIL_BACKEND = 'tests.test_18_email_outbox.FailingBackend'
+        signup(client, 1)
+        call_command('send_emails', '--once')
+        email = OutgoingEmail.objects.get()
+        assert email.attempts == 1 and 'ConnectionError' in email.last_error
+        assert email.next_attempt_at > timezone.now(), (
+            'Проверьте, что неотправленное письмо откладывается.'
+        )
+        first_delay = email.next_attempt_at - timezone.now()
+
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        call_command('send_emails', '--once')
+        email.refresh_from_db()
+        assert email.attempts == 2
+        assert email.next_attempt_at - timezone.now() > (
+            first_delay + timedelta(seconds=1)
+        ), (
+            'Проверьте, что задержка между попытками растёт.'
+        )
+
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend'
+        )
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        call_command('send_emails', '--once')
+        assert len(mail.outbox) == 1
+        assert not OutgoingEmail.objects.exists()
+
+    def test_04_file_backend(self, client, settings, tmp_path,
+                             deferred_outbox):
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.filebased.EmailBackend'
+        )
+        settings.EMAIL_FILE_PATH = tmp_path
+        signup(client, 1)
+        call_command('send_emails', '--once')
+        files = list(tmp_path.iterdir())
+        assert len(files) == 1
+        assert 'user1@yamdb.fake' in files[0].read_text()
@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19UserUniqueness:
+
+    SIGNUP_URL = '/api/v1/auth/signup/'
+
+    def test_01_single_query(self, django_user_model, user, admin,
+                             django_assert_num_queries):
+        with django_assert_num_queries(1):
+            result = django_user_model.find_collisions(
+                user.username, admin.email
+            )
+        assert result == (True, True, False), (
+            'Проверьте, что `find_collisions` одним запросом возвращает '
+            'занятость username, email и их принадлежность одному '
+            'пользователю.'
+        )
+        assert django_user_model.find_collisions(
+            user.username, user.email
+        ) == (True, True, True)
+        assert django_user_model.find_collisions(
+            user.username, user.email, exclude_pk=user.pk
+        ) == (False, False, False)
+
+    def test_02_signup_with_foreign_email(self, client, user, admin):
+        response = client.post(self.SIGNUP_URL, data={
+            'username': user.username, 'email': admin.email
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что регистрация с username одного пользователя и '
+            'email другого возвращает ответ со статусом 400.'
+        )
+
+    def test_03_email_unique_in_db(self, django_user_model, user):
+        with pytest.raises(IntegrityError), transaction.atomic():
+            django_user_model.objects.create(
+                username='other', email=user.email
+            )
+        django_user_model.objects.create(username='empty1', email='')
+        django_user_model.objects.create(username='empty2', email='')
+
+    def test_04_clean_reports_both_fields(self, django_user_model, user,
+                                          admin):
+        duplicate = django_user_model(username=user.username,
+                                      email=admin.email)
+        with pytest.raises(ValidationError) as error:
+            duplicate.clean()
+        assert set(error.value.message_dict) == {'username', 'email'}, (
+            'Проверьте, что `clean` сообщает обо всех занятых полях.'
+        )
+
+    def test_05_migration_reports_duplicate_emails(self, django_user_model):
+        from django.db import connection
+        from django.db.migrations.executor import MigrationExecutor
+
+        before = [('users', '0002_outgoingemail')]
+        after = [('users', '0003_unique_user_email')]
+        MigrationExecutor(connection).migrate(before)
+        try:
+            users = [
+                django_user_model.objects.create(
+                    username=f'twin{number}', email='twin@yamdb.fake'
+                )
+                for number in range(2)
+            ]
+            with pytest.raises(IntegrityError) as error:
+                MigrationExecutor(connection).migrate(after)
+            assert (
+                f'twin@yamdb.fake: id {users[0].pk}, {users[1].pk}'
+                in str(error.value)
+            ), (
+                'Проверьте, что миграция уникального email перечисляет '
+                'пользователей с повторяющимися адресами.'
+            )
+        finally:
+            django_user_model.objects.filter(username='twin1').delete()
+            MigrationExecutor(connection).migrate(after)
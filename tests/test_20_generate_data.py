@@ -0,0 +1,77 @@
+from collections import Counter
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20GenerateData:
+
+    OPTIONS = {
+        'users': 200,
+        'categories': 5,
+        'genres': 10,
+        'titles': 100,
+        'reviews': 2000,
+        'comments': 3000,
+        'batch_size': 500,
+    }
+
+    def generate(self, **options):
+        call_command('generate_data', **{**self.OPTIONS, **options})
+
+    def test_01_counts_and_integrity(self, user):
+        from reviews.models import Category, Comment, Genre, Review, Title
+
+        self.generate()
+        assert Title.objects.count() == 100
+        assert Category.objects.count() == 5 and Genre.objects.count() == 10
+        reviews = Review.objects.count()
+        comments = Comment.objects.count()
+        assert 0 < reviews <= 2000 and 0 < comments <= 3000, (
+            'Проверьте, что `generate_data` создаёт не больше заданного '
+            'числа отзывов и комментариев.'
+        )
+        fanout = Counter(
+            Title.objects.annotate(genres=Count('genre'))
+            .values_list('genres', flat=True)
+        )
+        assert set(fanout) <= {1, 2, 3, 4}, (
+            'Проверьте, что у произведения от одного до четырёх жанров.'
+        )
+        call_command('rebuild_ratings', '--check')
+
+        title = Title.objects.create(name='Новое', year=2000)
+        assert title.pk == 101, (
+            'Проверьте, что после `generate_data` новые объекты получают '
+            'следующие первичные ключи.'
+        )
+
+    def test_02_power_law(self):
+        from reviews.models import Review
+
+        self.generate(users=1000, reviews=5000, alpha=1.3)
+        per_title = sorted(
+            Review.objects.order_by().values('title')
+            .annotate(total=Count('id')).values_list('total', flat=True),
+            reverse=True
+        )
+        top = sum(per_title[:10])
+        assert top > sum(per_title) * 0.3, (
+            'Проверьте, что отзывы распределены по произведениям '
+            'неравномерно: десятая часть произведений собирает большую '
+            'долю отзывов.'
+        )
+
+    def test_03_reproducible(self):
+        from reviews.models import Review
+
+        self.generate(clear=True)
+        first = list(Review.objects.values_list('title', 'author', 'score'))
+        self.generate(clear=True)
+        second = list(Review.objects.values_list('title', 'author', 'score'))
+        assert first == second, (
+            'Проверьте, что `generate_data` с одним `--seed` создаёт '
+            'одинаковые данные.'
+        )
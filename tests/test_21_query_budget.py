@@ -0,0 +1,61 @@
+import pytest
+
+from tests.fixtures.fixture_query_budget import get_fingerprint
+from tests.query_budgets import QUERY_BUDGETS
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21QueryBudget:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_fingerprint_ignores_values(self):
+        first = get_fingerprint(
+            'SELECT * FROM "users" WHERE "id" = 1 AND "name" = \'a\'\'b\''
+        )
+        second = get_fingerprint(
+            'SELECT * FROM "users" WHERE "id" = 25 AND "name" = \'c\''
+        )
+        assert first == second == (
+            'SELECT * FROM "users" WHERE "id" = ? AND "name" = ?'
+        ), 'Проверьте, что отпечаток запроса не содержит значений.'
+        assert get_fingerprint('WHERE "id" IN (1, 2, 3)') == (
+            get_fingerprint('WHERE "id" IN (4)')
+        ), 'Проверьте, что списки IN сворачиваются в отпечатке запроса.'
+
+    def test_02_over_budget_call_fails(self, client, monkeypatch):
+        from reviews.models import Title
+
+        Title.objects.create(name='Сталкер', year=1979)
+        monkeypatch.setitem(QUERY_BUDGETS, ('title-list', 'list'), 1)
+        with pytest.raises(pytest.fail.Exception) as error:
+            client.get(self.TITLES_URL)
+        message = str(error.value)
+        assert 'бюджете 1' in message and 'title-list' in message, (
+            'Проверьте, что превышение бюджета называет маршрут и бюджет.'
+        )
+
+    def test_03_repeated_queries_are_listed(self, admin_client,
+                                            monkeypatch):
+        from reviews.models import Genre
+
+        genres = [
+            Genre.objects.create(name=f'Жанр {number}', slug=f'g{number}')
+            for number in range(3)
+        ]
+        monkeypatch.setitem(QUERY_BUDGETS, ('title-list', 'create'), 1)
+        with pytest.raises(pytest.fail.Exception) as error:
+            admin_client.post(self.TITLES_URL, data={
+                'name': 'Сталкер',
+                'year': 1979,
+                'genre': [genre.slug for genre in genres],
+            })
+        assert ' x SELECT' in str(error.value), (
+            'Проверьте, что при превышении бюджета перечисляются '
+            'повторяющиеся запросы.'
+        )
+
+    def test_04_unknown_route_fails(self, client, monkeypatch):
+        monkeypatch.delitem(QUERY_BUDGETS, ('title-list', 'list'))
+        with pytest.raises(pytest.fail.Exception, match='не задан бюджет'):
+            client.get(self.TITLES_URL)
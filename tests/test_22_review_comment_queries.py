@@ -0,0 +1,100 @@
+import pytest
+
+REVIEWS_LIST_QUERIES = 3
+COMMENTS_LIST_QUERIES = 3
+OBJECTS_COUNT = 500
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22ReviewCommentQueries:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @pytest.fixture
+    def review(self, django_user_model):
+        from reviews.models import Comment, Review, Title
+
+        django_user_model.objects.bulk_create(
+            django_user_model(
+                username=f'author{number}', email=f'author{number}@yamdb.fake'
+            )
+            for number in range(OBJECTS_COUNT)
+        )
+        authors = django_user_model.objects.all()
+        title = Title.objects.create(name='Сталкер', year=1979)
+        Review.objects.bulk_create(
+            Review(title=title, author=author, text='Отзыв', score=5)
+            for author in authors
+        )
+        review = Review.objects.first()
+        Comment.objects.bulk_create(
+            Comment(review=review, author=author, text='Комментарий')
+            for author in authors
+        )
+        return review
+
+    @pytest.mark.parametrize('limit', (5, 50, 500))
+    def test_01_reviews_list_query_count(self, client, review,
+                                         django_assert_num_queries, limit):
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=review.title_id)
+        with django_assert_num_queries(REVIEWS_LIST_QUERIES):
+            response = client.get(f'{url}?limit={limit}')
+        results = response.json()['results']
+        assert len(results) == limit, (
+            f'Проверьте, что `{url}` учитывает параметр `limit`.'
+        )
+        assert all(result['author'].startswith('author')
+                   for result in results), (
+            f'Проверьте, что `{url}` возвращает имена авторов отзывов.'
+        )
+
+    @pytest.mark.parametrize('limit', (5, 50, 500))
+    def test_02_comments_list_query_count(self, client, review,
+                                          django_assert_num_queries, limit):
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=review.title_id, review_id=review.id
+        )
+        with django_assert_num_queries(COMMENTS_LIST_QUERIES):
+            response = client.get(f'{url}?limit={limit}')
+        results = response.json()['results']
+        assert len(results) == limit, (
+            f'Проверьте, что `{url}` учитывает параметр `limit`.'
+        )
+        assert all(result['author'].startswith('author')
+                   for result in results), (
+            f'Проверьте, что `{url}` возвращает имена авторов комментариев.'
+        )
+
+    def test_03_missing_parent_not_found(self, client, review):
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=0)
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=review.title_id, review_id=0
+        )
+        for url in (reviews_url, comments_url):
+            assert client.get(url).status_code == 404, (
+                f'Проверьте, что `{url}` с несуществующим родительским '
+                'объектом возвращает ответ со статусом 404.'
+            )
+
+    def test_04_create_checks_parent_once(self, user_client, review):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Солярис', year=1972)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'Да', 'score': 8})
+        assert response.status_code == 201
+        title_checks = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT (1) AS "a" FROM "reviews_title"')
+        ]
+        assert len(title_checks) == 1, (
+            f'Проверьте, что POST-запрос к `{url}` проверяет существование '
+            'произведения одним запросом.'
+        )
@@ -0,0 +1,68 @@
+from datetime import datetime, timezone
+
+import pytest
+from django.db import connection
+
+REVIEW_INDEX = 'review_title_pub_date_idx'
+COMMENT_INDEX = 'comment_review_pub_date_idx'
+PUB_DATE = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+def explain(queryset):
+    """Строки EXPLAIN QUERY PLAN для запроса queryset."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23ReviewCommentIndexes:
+
+    @pytest.fixture
+    def querysets(self):
+        from reviews.models import Comment, Review
+
+        reviews = Review.objects.filter(title_id=1).select_related('author')
+        comments = Comment.objects.filter(
+            review_id=1
+        ).select_related('author')
+        return (
+            (REVIEW_INDEX, reviews[10:15]),
+            (REVIEW_INDEX, reviews.filter(pub_date__gt=PUB_DATE)[:6]),
+            (REVIEW_INDEX, reviews.order_by('-pub_date', '-id')[:6]),
+            (COMMENT_INDEX, comments[10:15]),
+            (COMMENT_INDEX, comments.filter(pub_date__gt=PUB_DATE)[:6]),
+            (COMMENT_INDEX, comments.order_by('-pub_date', '-id')[:6]),
+        )
+
+    def test_01_nested_lists_use_composite_index(self, querysets):
+        for index, queryset in querysets:
+            plan = explain(queryset)
+            assert any(index in step for step in plan), (
+                f'Проверьте, что запрос `{queryset.query}` использует '
+                f'индекс `{index}`. План: {plan}'
+            )
+            assert not any('TEMP B-TREE' in step for step in plan), (
+                f'Проверьте, что запрос `{queryset.query}` не сортирует '
+                f'строки во временном B-дереве. План: {plan}'
+            )
+
+    def test_02_default_ordering(self):
+        from reviews.models import Comment, Review
+
+        for model in (Review, Comment):
+            assert model._meta.ordering == ('pub_date', 'id'), (
+                f'Проверьте, что `{model.__name__}` по умолчанию '
+                'сортируется по `pub_date` и `id`.'
+            )
+
+    def test_03_author_title_check_uses_unique_index(self):
+        from reviews.models import Review
+
+        plan = explain(Review.objects.filter(title_id=1, author_id=1))
+        assert any('sqlite_autoindex_reviews_review' in step
+                   for step in plan), (
+            'Проверьте, что проверка единственного отзыва автора на '
+            f'произведение использует уникальный индекс. План: {plan}'
+        )
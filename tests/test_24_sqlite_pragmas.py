@@ -0,0 +1,72 @@
+import pytest
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+EXPECTED_PRAGMAS = {
+    'journal_mode': 'wal',
+    'busy_timeout': 5000,
+    'synchronous': 1,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'temp_store': 2,
+}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24SqlitePragmas:
+
+    @pytest.fixture
+    def new_connection(self, tmp_path):
+        """Новое соединение с файловой БД, как у сервера."""
+        wrapper = DatabaseWrapper(
+            {**connection.settings_dict, 'NAME': str(tmp_path / 'db.sqlite3')},
+            alias='pragmas'
+        )
+        yield wrapper
+        wrapper.close()
+
+    def get_pragmas(self, wrapper):
+        with wrapper.cursor() as cursor:
+            return {
+                name: cursor.execute(f'PRAGMA {name}').fetchone()[0]
+                for name in EXPECTED_PRAGMAS
+            }
+
+    def test_01_pragmas_applied_on_connect(self, settings, new_connection):
+        settings.SQLITE = {
+            **settings.SQLITE,
+            'PRAGMAS': {
+                'busy_timeout': 5000,
+                'journal_mode': 'WAL',
+                'synchronous': 'NORMAL',
+                'mmap_size': 256 * 1024 * 1024,
+                'cache_size': -64 * 1024,
+                'temp_store': 'MEMORY',
+            },
+        }
+        assert self.get_pragmas(new_connection) == EXPECTED_PRAGMAS, (
+            'Проверьте, что при создании соединения с SQLite выполняются '
+            'PRAGMA из настройки `SQLITE`.'
+        )
+
+    def test_02_tuning_disabled(self, settings, new_connection):
+        settings.SQLITE = {**settings.SQLITE, 'ENABLED': False}
+        pragmas = self.get_pragmas(new_connection)
+        assert pragmas['journal_mode'] == 'delete', (
+            'Проверьте, что при `SQLITE[\'ENABLED\'] = False` PRAGMA '
+            'не выполняются.'
+        )
+
+    def test_03_none_keeps_default(self, settings, new_connection):
+        settings.SQLITE = {
+            'ENABLED': True,
+            'PRAGMAS': {'journal_mode': None, 'temp_store': 'MEMORY'},
+        }
+        pragmas = self.get_pragmas(new_connection)
+        assert pragmas['journal_mode'] == 'delete', (
+            'Проверьте, что PRAGMA со значением None не выполняется.'
+        )
+        assert pragmas['temp_store'] == 2, (
+            'Проверьте, что остальные PRAGMA выполняются.'
+        )
+
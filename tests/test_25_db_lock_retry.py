@@ -0,0 +1,187 @@
+import pytest
+from django.db import OperationalError, connection, transaction
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test.utils import CaptureQueriesContext
+
+from tests.query_budgets import QUERY_BUDGETS
+from tests.test_14_metrics import get_sample
+
+
+def fail_first_calls(monkeypatch, view_class, name, failures, message):
+    """
+    Подменяет метод представления: первые failures вызовов выполняют
+    запись и падают с OperationalError, как при блокировке БД.
+    """
+    original = getattr(view_class, name)
+    calls = []
+
+    def flaky(self, *args, **kwargs):
+        result = original(self, *args, **kwargs)
+        calls.append(name)
+        if len(calls) <= failures:
+            raise OperationalError(message)
+        return result
+
+    monkeypatch.setattr(view_class, name, flaky)
+    return calls
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25DbLockRetry:
+
+    METRICS_URL = '/metrics'
+
+    @pytest.fixture(autouse=True)
+    def fast_retry(self, settings, monkeypatch):
+        settings.DB_LOCK_RETRY = {
+            **settings.DB_LOCK_RETRY, 'ATTEMPTS': 3, 'BACKOFF_MS': 0
+        }
+        # Каждая попытка заново выполняет запросы к БД.
+        for key in (('review-list', 'create'), ('user-signup-list', 'create')):
+            monkeypatch.setitem(QUERY_BUDGETS, key, QUERY_BUDGETS[key] * 3)
+
+    @pytest.fixture
+    def title(self):
+        from reviews.models import Title
+
+        return Title.objects.create(name='Сталкер', year=1979)
+
+    def get_metric(self, client, name):
+        return get_sample(
+            client.get(self.METRICS_URL).content.decode(), name,
+            view='ReviewViewSet', action='create'
+        ) or 0
+
+    def test_01_locked_write_is_retried(self, client, user_client, title,
+                                        monkeypatch):
+        from api.views import ReviewViewSet
+        from reviews.models import Review
+
+        retries = self.get_metric(client, 'api_db_lock_retries_total')
+        calls = fail_first_calls(
+            monkeypatch, ReviewViewSet, 'perform_create', 2,
+            'database is locked'
+        )
+        response = user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'Отзыв', 'score': 8}
+        )
+        assert response.status_code == 201, (
+            'Проверьте, что запрос, упавший из-за блокировки БД, '
+            'выполняется повторно.'
+        )
+        assert len(calls) == 3 and Review.objects.count() == 1, (
+            'Проверьте, что при повторе запись неудачной попытки '
+            'откатывается.'
+        )
+        title.refresh_from_db()
+        assert (title.rating_count, title.rating) == (1, 8), (
+            'Проверьте, что рейтинг учитывает отзыв один раз.'
+        )
+        assert self.get_metric(
+            client, 'api_db_lock_retries_total'
+        ) == retries + 2, (
+            'Проверьте, что метрика `api_db_lock_retries_total` '
+            'считает повторы.'
+        )
+
+    def test_02_gives_up_with_503(self, client, user_client, title,
+                                  monkeypatch):
+        from api.views import ReviewViewSet
+        from reviews.models import Review
+
+        giveups = self.get_metric(client, 'api_db_lock_giveups_total')
+        fail_first_calls(
+            monkeypatch, ReviewViewSet, 'perform_create', 3,
+            'database is locked'
+        )
+        response = user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'Отзыв', 'score': 8}
+        )
+        assert response.status_code == 503, (
+            'Проверьте, что после исчерпания попыток возвращается ответ '
+            'со статусом 503.'
+        )
+        assert response.has_header('Retry-After'), (
+            'Проверьте, что ответ 503 содержит заголовок `Retry-After`.'
+        )
+        assert not Review.objects.exists(), (
+            'Проверьте, что записи неудачных попыток откатываются.'
+        )
+        assert self.get_metric(
+            client, 'api_db_lock_giveups_total'
+        ) == giveups + 1, (
+            'Проверьте, что метрика `api_db_lock_giveups_total` '
+            'считает неудачные запросы.'
+        )
+
+    def test_03_other_errors_not_retried(self, user_client, title,
+                                         monkeypatch):
+        from api.views import ReviewViewSet
+
+        calls = fail_first_calls(
+            monkeypatch, ReviewViewSet, 'perform_create', 1,
+            'no such table'
+        )
+        with pytest.raises(OperationalError):
+            user_client.post(
+                f'/api/v1/titles/{title.id}/reviews/',
+                data={'text': 'Отзыв', 'score': 8}
+            )
+        assert len(calls) == 1, (
+            'Проверьте, что повторяются только запросы, упавшие '
+            'из-за блокировки БД.'
+        )
+
+    def test_04_signup_is_retried(self, client, monkeypatch):
+        from users.serializers import UserSignupSerializer
+
+        calls = fail_first_calls(
+            monkeypatch, UserSignupSerializer, 'create', 1,
+            'database is locked'
+        )
+        response = client.post('/api/v1/auth/signup/', data={
+            'username': 'locked', 'email': 'locked@yamdb.fake'
+        })
+        assert response.status_code == 200 and len(calls) == 2, (
+            'Проверьте, что регистрация повторяется при блокировке БД.'
+        )
+
+    def test_05_transaction_mode_opt_in(self, settings, monkeypatch,
+                                        tmp_path):
+        from api.retry import call_with_retry, configure_transaction_mode
+
+        wrapper = DatabaseWrapper(
+            {**connection.settings_dict, 'NAME': str(tmp_path / 'db.sqlite3')},
+            alias='retry'
+        )
+        wrapper.ensure_connection()
+        wrapper.close()
+        assert '_start_transaction_under_autocommit' not in vars(wrapper), (
+            'Проверьте, что по умолчанию начало транзакций SQLite '
+            'не заменяется.'
+        )
+
+        settings.DB_LOCK_RETRY = {
+            **settings.DB_LOCK_RETRY, 'TRANSACTION_MODE': 'IMMEDIATE'
+        }
+        monkeypatch.setattr(
+            connection, '_start_transaction_under_autocommit',
+            connection._start_transaction_under_autocommit
+        )
+        configure_transaction_mode(None, connection)
+
+        def atomic(func):
+            with transaction.atomic():
+                func()
+
+        for begin, expected in ((call_with_retry, 'BEGIN IMMEDIATE'),
+                                (atomic, 'BEGIN')):
+            with CaptureQueriesContext(connection) as context:
+                begin(lambda: None)
+            assert context.captured_queries[0]['sql'] == expected, (
+                'Проверьте, что в режиме из '
+                '`DB_LOCK_RETRY[\'TRANSACTION_MODE\']` начинаются только '
+                'повторяемые транзакции.'
+            )
@@ -0,0 +1,142 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA = 'replica1'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26ReplicaRouter:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture(autouse=True)
+    def replica(self, settings, tmp_path):
+        """Реплика — отдельный файл SQLite, её обновляет replicate_db."""
+        connections.databases[REPLICA] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': str(tmp_path / 'replica.sqlite3'),
+        }
+        connections.ensure_defaults(REPLICA)
+        connections.prepare_test_settings(REPLICA)
+        settings.REPLICAS = {**settings.REPLICAS, 'ALIASES': (REPLICA,)}
+        settings.CACHES = {**settings.CACHES, 'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path / 'cache'),
+        }}
+        settings.API_CACHE = {**settings.API_CACHE, 'ENABLED': False}
+        call_command('replicate_db', once=True, stdout=None)
+        yield
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.databases[REPLICA]
+
+    @pytest.fixture
+    def title(self):
+        from reviews.models import Title
+
+        return Title.objects.create(name='Сталкер', year=1979)
+
+    def get_titles_count(self, client):
+        response = client.get(self.TITLES_URL)
+        assert response.status_code == 200
+        return response.json()['count']
+
+    def test_01_reads_from_replica(self, client, title):
+        assert self.get_titles_count(client) == 0, (
+            'Проверьте, что GET-запросы к API читают из реплики.'
+        )
+        call_command('replicate_db', once=True, stdout=None)
+        assert self.get_titles_count(client) == 1, (
+            'Проверьте, что replicate_db копирует основную БД в реплику.'
+        )
+
+    def test_02_writes_go_to_primary(self, admin_client):
+        from reviews.models import Category, Genre, Title
+
+        Category.objects.create(name='Фильм', slug='movie')
+        Genre.objects.create(name='Драма', slug='drama')
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Солярис', 'year': 1972, 'category': 'movie',
+            'genre': ['drama']
+        })
+        assert response.status_code == 201
+        assert Title.objects.using(DEFAULT_DB_ALIAS).count() == 1, (
+            'Проверьте, что запись идёт в основную БД.'
+        )
+        assert not Title.objects.using(REPLICA).exists(), (
+            'Проверьте, что запись не идёт в реплику.'
+        )
+
+    def test_03_read_your_writes(self, client, user_client, admin_client,
+                                 title):
+        reviews_url = f'{self.TITLES_URL}{title.id}/reviews/'
+        call_command('replicate_db', once=True, stdout=None)
+        response = user_client.post(reviews_url, data={
+            'text': 'Отзыв', 'score': 9
+        })
+        assert response.status_code == 201
+        assert user_client.get(reviews_url).json()['count'] == 1, (
+            'Проверьте, что после записи пользователь читает из основной '
+            'БД и видит свои изменения.'
+        )
+        assert client.get(reviews_url).json()['count'] == 0, (
+            'Проверьте, что другие пользователи читают из реплики.'
+        )
+        assert admin_client.get(reviews_url).json()['count'] == 0, (
+            'Проверьте, что чтение из основной БД после записи касается '
+            'только автора изменений.'
+        )
+
+    def test_04_reads_outside_requests_use_primary(self, title):
+        from reviews.models import Title
+
+        assert Title.objects.filter(pk=title.pk).exists(), (
+            'Проверьте, что вне запросов к API чтение идёт из основной БД.'
+        )
+
+    def test_05_replicate_unknown_alias(self):
+        with pytest.raises(CommandError):
+            call_command('replicate_db', once=True, aliases=['missing'])
+
+    def test_06_replica_reads_not_cached(self, client, settings, title):
+        from reviews.models import Title
+
+        settings.API_CACHE = {
+            **settings.API_CACHE, 'ENABLED': True, 'ETAGS': True
+        }
+        call_command('replicate_db', once=True, stdout=None)
+        Title.objects.create(name='Солярис', year=1972)
+        response = client.get(self.TITLES_URL)
+        assert response.json()['count'] == 1
+        assert 'ETag' not in response, (
+            'Проверьте, что ответы, прочитанные из реплики, не получают '
+            'ETag: реплика может отставать от версий коллекций.'
+        )
+        call_command('replicate_db', once=True, stdout=None)
+        assert self.get_titles_count(client) == 2, (
+            'Проверьте, что ответы, прочитанные из реплики, не кэшируются.'
+        )
+
+    def test_07_local_cache_rejected(self, settings):
+        from django.test import Client
+
+        settings.CACHES = {**settings.CACHES, 'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }}
+        with pytest.raises(ImproperlyConfigured):
+            Client().get(self.TITLES_URL)
+
+    def test_08_authentication_reads_primary(self, user_client, user):
+        user.role = 'moderator'
+        user.save()
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == 200, (
+            'Проверьте, что пользователь из токена ищется в основной БД, '
+            'даже если реплика его ещё не получила.'
+        )
+        assert response.json()['role'] == 'moderator', (
+            'Проверьте, что пользователь из токена читается из основной '
+            'БД, а не из отстающей реплики.'
+        )
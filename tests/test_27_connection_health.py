@@ -0,0 +1,59 @@
+import pytest
+from django.core.signals import request_started
+from django.db import connections
+
+ALIAS = 'health'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27ConnectionHealth:
+
+    @pytest.fixture
+    def connection(self, tmp_path):
+        """Постоянное соединение с отдельным файлом SQLite."""
+        connections.databases[ALIAS] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': str(tmp_path / 'health.sqlite3'),
+            'CONN_MAX_AGE': 60,
+        }
+        connections.ensure_defaults(ALIAS)
+        connections.prepare_test_settings(ALIAS)
+        connection = connections[ALIAS]
+        connection.ensure_connection()
+        yield connection
+        connection.close()
+        del connections[ALIAS]
+        del connections.databases[ALIAS]
+
+    def test_01_conn_max_age(self, settings):
+        assert all(
+            database['CONN_MAX_AGE'] == settings.CONN_MAX_AGE
+            for database in settings.DATABASES.values()
+        ), (
+            'Проверьте, что CONN_MAX_AGE задан для всех БД из DATABASES.'
+        )
+
+    def test_02_broken_connection_closed(self, connection, monkeypatch):
+        monkeypatch.setattr(connection, 'is_usable', lambda: False)
+        request_started.send(sender=self.__class__)
+        assert connection.connection is None, (
+            'Проверьте, что перед запросом неработающее соединение '
+            'закрывается.'
+        )
+
+    def test_03_usable_connection_reused(self, connection):
+        raw_connection = connection.connection
+        request_started.send(sender=self.__class__)
+        assert connection.connection is raw_connection, (
+            'Проверьте, что рабочее соединение используется повторно.'
+        )
+
+    def test_04_health_checks_disabled(self, connection, monkeypatch,
+                                       settings):
+        settings.DATABASE_HEALTH_CHECKS = False
+        monkeypatch.setattr(connection, 'is_usable', lambda: False)
+        request_started.send(sender=self.__class__)
+        assert connection.connection is not None, (
+            'Проверьте, что при DATABASE_HEALTH_CHECKS=False соединения '
+            'перед запросом не проверяются.'
+        )
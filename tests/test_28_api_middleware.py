@@ -0,0 +1,46 @@
+import pytest
+from django.core.management import call_command
+from django.test import Client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28ApiMiddleware:
+
+    API_URL = '/api/v1/categories/'
+    ADMIN_LOGIN_URL = '/admin/login/'
+
+    def test_01_api_skips_site_middleware(self, client):
+        response = client.get(self.API_URL)
+        assert response.status_code == 200
+        assert not hasattr(response.wsgi_request, 'session'), (
+            'Проверьте, что запросы к API не загружают сессию.'
+        )
+        assert 'X-Frame-Options' not in response, (
+            'Проверьте, что ответы API не проходят XFrameOptionsMiddleware.'
+        )
+
+    def test_02_admin_keeps_site_middleware(self, client):
+        response = client.get(self.ADMIN_LOGIN_URL)
+        assert response.status_code == 200
+        assert hasattr(response.wsgi_request, 'session'), (
+            'Проверьте, что админка использует сессии.'
+        )
+        assert response['X-Frame-Options'] == 'DENY', (
+            'Проверьте, что ответы админки получают X-Frame-Options.'
+        )
+        assert 'csrftoken' in response.cookies, (
+            'Проверьте, что админка выдаёт CSRF-cookie.'
+        )
+
+    def test_03_admin_checks_csrf(self):
+        client = Client(enforce_csrf_checks=True)
+        response = client.post(self.ADMIN_LOGIN_URL, data={
+            'username': 'admin', 'password': 'admin'
+        })
+        assert response.status_code == 403, (
+            'Проверьте, что POST-запросы к админке без CSRF-токена '
+            'отклоняются.'
+        )
+
+    def test_04_admin_system_checks(self):
+        call_command('check', 'admin')